@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Script to measure the import time of the entry-points of ``acg`` with ``python -X importtime``.
+
+Usage::
+
+    python .utils/benchmark_imports.py --repeat=5 --top=15
+    python .utils/benchmark_imports.py --record
+
+Every module of :const:`MODULES` is imported in a fresh interpreter ``repeat`` times, the median of its cumulative
+import time is printed together with the ``top`` imports with the largest own import time. ``--record`` saves the
+medians under the current version in ``.utils/import_times.json`` and compares them to the previously recorded
+version, such that regressions of the start-up time show up before a release.
+"""
+import argparse
+import json
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+from acg import __version__  # pylint: disable=wrong-import-position
+
+MODULES = ["acg", "acg.cli", "acg.templates", "acg.main"]
+"""Modules imported on start of ``acg batch`` (``acg.cli``, ``acg.templates``) and of the app (``acg.main``)."""
+RECORD_PATH = pathlib.Path(__file__).parent / "import_times.json"
+
+
+def import_times(module):
+    """Return dict ``{imported module: (self, cumulative)}`` in ms of importing ``module`` in a fresh interpreter."""
+    env = dict(os.environ, KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(own) / 1000, int(cumulative) / 1000)
+    return times
+
+
+def measure(module, repeat=5):
+    """Return median cumulative import time of ``module`` in ms and the times of the last run."""
+    import_times(module)  # write the pyc-files
+    runs = [import_times(module) for _ in range(repeat)]
+    return statistics.median(run[module][1] for run in runs), runs[-1]
+
+
+def previous_record(records):
+    """Return ``(version, times)`` of the latest record of another version than the current one."""
+    others = [version for version in records if version != __version__]
+    return (others[-1], records[others[-1]]) if others else (None, {})
+
+
+def run(repeat=5, top=10, record=False):
+    """Print the import times of :const:`MODULES` and optionally record them."""
+    records = json.loads(RECORD_PATH.read_text()) if RECORD_PATH.exists() else {}
+    previous_version, previous = previous_record(records)
+    medians = {}
+    for module in MODULES:
+        medians[module], times = measure(module, repeat)
+        change = (
+            f" ({medians[module] - previous[module]:+.0f} ms since {previous_version})"
+            if module in previous
+            else ""
+        )
+        print(f"{module}: {medians[module]:.0f} ms{change}")
+        slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)
+        for name, (own, cumulative) in slowest[:top]:
+            print(f"    {name:<40}{own:8.1f} ms own {cumulative:8.1f} ms cumulative")
+    if record:
+        records[__version__] = {module: round(ms, 1) for module, ms in medians.items()}
+        RECORD_PATH.write_text(json.dumps(records, indent=2) + "\n")
+        print(f"recorded as version {__version__} in {RECORD_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--record", action="store_true")
+    args = parser.parse_args()
+    run(args.repeat, args.top, args.record)
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Script to compare lemmatization phrase by phrase with the batched and cached :func:`acg.language_processing.lemma_dict`.
+
+Usage::
+
+    python .utils/benchmark_lemmatizer.py words.txt --sentences=examples.txt --language=pt --batch-size=256
+    python .utils/benchmark_lemmatizer.py words.txt --model=path/to/pipeline
+
+``words.txt`` contains one word or phrase per line, e.g. an import of the app. ``examples.txt`` contains one example
+sentence per line, every sentence is tagged with its first word by :func:`acg.language_processing.tag_word_in_sentence`.
+Times are printed for one call of the pipeline per phrase (as before batching), for :func:`lemma_dict` with an empty
+cache and for :func:`lemma_dict` with the lemmas cached on disk and in memory. The cache is a temporary file, the one
+of the app is not used.
+``--model`` loads another model than the one in :const:`acg.language_processing.MODELS`, e.g. a saved pipeline.
+Results are kept in ``.utils/benchmark_results/``.
+"""
+import argparse
+import os
+import pathlib
+import sys
+import tempfile
+import time
+from unittest import mock
+
+sys.path.append(os.path.abspath("."))
+
+# pylint: disable=wrong-import-position
+from acg.language_processing import (
+    join_lemmas,
+    lemma_dict,
+    nlp_manager,
+    tag_word_in_sentence,
+)
+from acg.lemma_cache import lemma_cache
+
+
+def timed(function, *args):
+    """Return seconds needed by ``function(*args)``."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def one_by_one(phrases, nlp):
+    """Lemmatize ``phrases`` with one call of ``nlp`` each."""
+    return {phrase: join_lemmas(nlp(phrase)) for phrase in phrases}
+
+
+def tag_all(sentences):
+    """Tag the first word in every sentence."""
+    for sentence in sentences:
+        tag_word_in_sentence(sentence, sentence.split()[0])
+
+
+def tag_all_one_by_one(sentences, nlp):
+    """Tag the first word in every sentence, lemmatizing every word with one call of ``nlp`` (as before batching)."""
+    with mock.patch(
+        "acg.language_processing.lemma_dict",
+        lambda phrases: one_by_one(phrases, nlp),
+    ):
+        tag_all(sentences)
+
+
+def from_disk(function, *args):
+    """Call ``function(*args)`` after emptying the in-memory layer of the cache, such that lemmas are read from disk."""
+    lemma_cache._memory.clear()  # pylint: disable=protected-access
+    function(*args)
+
+
+def print_times(name, timings):
+    """Print ``timings`` (dict ``{method: seconds}``) and the speed-up relative to the first one."""
+    baseline = next(iter(timings.values()))
+    print(name)
+    for method, seconds in timings.items():
+        print(f"{method:>24}: {seconds:8.2f} s {baseline / max(seconds, 1e-9):8.1f}x")
+
+
+def run(words_path, sentences_path=None, language="pt"):
+    """Print the times for lemmatizing the words and tagging the sentences."""
+    nlp = nlp_manager.get(language)
+    if nlp is None:
+        sys.exit(f"no spacy model available for {language!r}")
+    phrases = pathlib.Path(words_path).read_text().splitlines()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        lemma_cache.path = pathlib.Path(tmp_dir) / "lemmas.sqlite"
+        print_times(
+            f"{len(phrases)} phrases",
+            {
+                "one call per phrase": timed(one_by_one, phrases, nlp),
+                "pipe, empty cache": timed(lemma_dict, phrases, nlp),
+                "pipe, cached on disk": timed(from_disk, lemma_dict, phrases, nlp),
+                "pipe, cached": timed(lemma_dict, phrases, nlp),
+            },
+        )
+        if sentences_path:
+            sentences = [
+                line
+                for line in pathlib.Path(sentences_path).read_text().splitlines()
+                if line.strip()
+            ]
+            nlp_manager.default_language = language
+            lemma_cache.clear()
+            print_times(
+                f"{len(sentences)} sentences",
+                {
+                    "one call per word": timed(tag_all_one_by_one, sentences, nlp),
+                    "pipe, empty cache": timed(tag_all, sentences),
+                    "pipe, cached on disk": timed(from_disk, tag_all, sentences),
+                    "pipe, cached": timed(tag_all, sentences),
+                },
+            )
+        print(f"lemma cache: {lemma_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("words")
+    parser.add_argument("--sentences", default=None)
+    parser.add_argument("--language", default="pt")
+    parser.add_argument("--batch-size", type=int, default=nlp_manager.batch_size)
+    parser.add_argument("--n-process", type=int, default=nlp_manager.n_process)
+    parser.add_argument("--model", default=None)
+    args = parser.parse_args()
+    nlp_manager.batch_size, nlp_manager.n_process = args.batch_size, args.n_process
+    nlp_manager.multiprocessing = args.n_process > 1
+    if args.model:
+        nlp_manager.models = {**nlp_manager.models, args.language: args.model}
+    run(args.words, args.sentences, args.language)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Script to compare the ``lxml``- and ``bs4``-backends of the parsers on saved html-files.
+
+Usage::
+
+    python .utils/benchmark_parsers.py fetch falar casa --recipes async_dicio async_reverso
+    python .utils/benchmark_parsers.py run --repeat=20
+
+``fetch`` saves the raw responses under ``.utils/fixtures/parsers/<recipe>/<phrase>.html``. ``run`` asserts that both
+backends return identical dicts for every saved file and prints the mean parse time per backend. Commit the fixtures
+together with the output of ``run`` in ``.utils/benchmark_results/parsers.txt``, such that the numbers can be
+reproduced.
+"""
+import argparse
+import os
+import pathlib
+import sys
+import timeit
+
+sys.path.append(os.path.abspath("."))
+
+from acg.parsers import parser_cookbook  # pylint: disable=wrong-import-position
+from acg.utils import run_async  # pylint: disable=wrong-import-position
+
+FIXTURE_DIR = pathlib.Path(__file__).parent / "fixtures" / "parsers"
+RECIPES = ["async_reverso", "async_dicio", "async_google_images", "english_parser"]
+BACKENDS = ["lxml", "bs4"]
+LANGUAGES = {"from_lang": "pt", "to_lang": "en"}
+
+
+def get_parser(recipe, backend="lxml", phrase=None):
+    """Return parser of ``recipe`` using ``backend``."""
+    return parser_cookbook.cook(
+        recipe, parse_backend=backend, phrase=phrase, **LANGUAGES
+    )
+
+
+async def fetch_response(recipe, phrase):
+    """Return response of the parser for ``phrase``, including follow-up requests."""
+    parser = get_parser(recipe, phrase=phrase)
+    return await parser.resolve_response(await parser.request())
+
+
+def fetch(phrases, recipes=RECIPES):
+    """Save responses of ``recipes`` for ``phrases`` as fixtures."""
+    for recipe in recipes:
+        directory = FIXTURE_DIR / recipe
+        directory.mkdir(parents=True, exist_ok=True)
+        for phrase in phrases:
+            (directory / f"{phrase}.html").write_text(
+                run_async(fetch_response(recipe, phrase))
+            )
+            print(f"saved {recipe}/{phrase}.html")
+
+
+def run(repeat=10):
+    """Check that both backends return the same results and print mean parse time in ms."""
+    if not any(FIXTURE_DIR.glob("*/*.html")):
+        sys.exit(f"no fixtures in {FIXTURE_DIR}, save some with 'fetch' first")
+    for recipe in RECIPES:
+        for path in sorted((FIXTURE_DIR / recipe).glob("*.html")):
+            html = path.read_text()
+            parsers = {backend: get_parser(recipe, backend) for backend in BACKENDS}
+            results = {
+                backend: parser.parse_response(html)
+                for backend, parser in parsers.items()
+            }
+            assert (
+                results["lxml"] == results["bs4"]
+            ), f"{recipe}/{path.name}: backends differ"
+            times = {
+                backend: timeit.timeit(
+                    lambda parser=parser: parser.parse_response(html), number=repeat
+                )
+                / repeat
+                * 1000
+                for backend, parser in parsers.items()
+            }
+            print(
+                f"{recipe:<20} {path.stem:<15} "
+                + " ".join(f"{backend}: {ms:7.2f} ms" for backend, ms in times.items())
+                + f"  speedup: {times['bs4'] / times['lxml']:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+    fetch_parser = commands.add_parser("fetch", help=fetch.__doc__)
+    fetch_parser.add_argument("phrases", nargs="+")
+    fetch_parser.add_argument("--recipes", nargs="+", default=RECIPES)
+    run_parser = commands.add_parser("run", help=run.__doc__)
+    run_parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    if args.command == "fetch":
+        fetch(args.phrases, args.recipes)
+    else:
+        run(args.repeat)
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Script to compare the commit throughput of sqlite with its defaults and with the profiles of ``acg.sqlite_profile``.
+
+Usage::
+
+    python .utils/benchmark_sqlite.py --commits=2000 --directory=/tmp
+
+Each run creates a fresh data-base in ``directory`` and imitates the queue-workers of the app: every word is one
+transaction that inserts a card with a json-payload and updates its state. Commits per second are printed per profile.
+Use a directory on the disk of interest, as ``/tmp`` may be a ram-disk.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath("."))
+
+from acg.sqlite_profile import (  # pylint: disable=wrong-import-position
+    PROFILES,
+    apply_pragmas,
+)
+
+PAYLOAD = json.dumps(
+    {"Translations": [["word", "palavra"]] * 20, "Examples": ["x" * 80] * 10}
+)
+
+
+def run_profile(pragmas, commits, directory):
+    """Return commits per second with ``pragmas`` applied."""
+    with tempfile.TemporaryDirectory(dir=directory) as tmp_dir:
+        connection = sqlite3.connect(os.path.join(tmp_dir, "db.sqlite"))
+        apply_pragmas(connection, pragmas)
+        connection.execute(
+            "CREATE TABLE Card (id INTEGER PRIMARY KEY, name TEXT UNIQUE, state TEXT, fields TEXT)"
+        )
+        connection.commit()
+        start = time.perf_counter()
+        for i in range(commits):
+            with connection:
+                connection.execute(
+                    "INSERT INTO Card (name, state, fields) VALUES (?, 'waiting', ?)",
+                    (f"word{i}", PAYLOAD),
+                )
+            with connection:
+                connection.execute(
+                    "UPDATE Card SET state = 'done' WHERE name = ?", (f"word{i}",)
+                )
+        elapsed = time.perf_counter() - start
+        connection.close()
+    return 2 * commits / elapsed
+
+
+def run(commits=1000, directory=None):
+    """Print commits per second for the sqlite defaults and for each profile."""
+    profiles = {"sqlite defaults": {}, **PROFILES}
+    for name, pragmas in profiles.items():
+        print(f"{name:>16}: {run_profile(pragmas, commits, directory):10.0f} commits/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--commits", type=int, default=1000)
+    parser.add_argument("--directory", default=None)
+    args = parser.parse_args()
+    run(args.commits, args.directory)
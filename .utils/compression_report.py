@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Script to report the size of the compressed columns of the data-base and to train dictionaries for ``acg.compression``.
+
+Usage::
+
+    python .utils/compression_report.py report --db=path/to/db.sqlite
+    python .utils/compression_report.py train --db=path/to/db.sqlite --size=16384
+    python .utils/compression_report.py migrate --db=path/to/db.sqlite
+
+``report`` prints per column the size of the plain json, of the stored values and compressed with each dictionary.
+``train`` builds a dictionary from the most frequent fragments of the stored json, prints the sizes it would give
+and the dictionary as python list, to be added to ``acg.compression.DICTIONARIES``. ``migrate`` applies pending
+migrations, e.g. to a data-base copied from a phone. Without ``--db`` the data-base of the app is used.
+"""
+import argparse
+import collections
+import os
+import sqlite3
+import sys
+
+sys.path.append(os.path.abspath("."))
+
+from acg import APP_DIR  # pylint: disable=wrong-import-position
+from acg.compression import (  # pylint: disable=wrong-import-position
+    DICTIONARIES,
+    compress,
+    decompress,
+)
+from acg.migrations import migrate  # pylint: disable=wrong-import-position
+
+COLUMNS = ["base_data", "fields"]
+
+
+def column_texts(path, column):
+    """Return list of tuples ``(stored value, json-string)`` of ``column`` of the table ``Card``."""
+    connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = connection.execute(
+            f'SELECT "{column}" FROM "Card" WHERE "{column}" IS NOT NULL'
+        ).fetchall()
+    finally:
+        connection.close()
+    return [
+        (value, value if isinstance(value, str) else decompress(value).decode())
+        for value, in rows
+    ]
+
+
+def sizes(texts, dictionary_id):
+    """Return total size of ``texts`` compressed with dictionary ``dictionary_id``."""
+    return sum(len(compress(text.encode(), dictionary_id)) for text in texts)
+
+
+def print_row(name, size, plain):
+    print(f"{name:>28}: {size:12d} bytes {size / max(plain, 1):7.1%}")
+
+
+def report(path):
+    """Print sizes of the columns :const:`COLUMNS`."""
+    print(f"file size: {os.path.getsize(path)} bytes")
+    for column in COLUMNS:
+        values = column_texts(path, column)
+        texts = [text for _, text in values]
+        plain = sum(len(text.encode()) for text in texts)
+        print(f"{column} ({len(values)} cards)")
+        print_row("plain json", plain, plain)
+        print_row(
+            "stored",
+            sum(
+                len(value if isinstance(value, bytes) else value.encode())
+                for value, _ in values
+            ),
+            plain,
+        )
+        for dictionary_id in DICTIONARIES:
+            print_row(f"dictionary {dictionary_id}", sizes(texts, dictionary_id), plain)
+
+
+def train(path, size=16 * 2 ** 10, length=16, stride=4):
+    """
+    Print a dictionary of at most ``size`` bytes built from the most frequent fragments of the stored json.
+
+    Fragments are the substrings of ``length`` characters starting every ``stride`` characters, ranked by the number
+    of cards they occur in. Fragments that occur in a single card only or are contained in the dictionary are skipped.
+    """
+    texts = [text for column in COLUMNS for _, text in column_texts(path, column)]
+    counts = collections.Counter()
+    for text in texts:
+        counts.update(
+            {text[i : i + length] for i in range(0, max(len(text) - length, 1), stride)}
+        )
+    fragments, candidate = [], ""
+    for fragment, number in counts.most_common():
+        if number < 2 or len(candidate) + len(fragment) > size:
+            break
+        if fragment not in candidate:
+            fragments.append(fragment)
+            candidate += fragment
+    fragments.reverse()
+    plain = sum(len(text.encode()) for text in texts)
+    new_id = max(DICTIONARIES) + 1
+    DICTIONARIES[new_id] = "".join(fragments).encode()
+    print_row("plain json", plain, plain)
+    for dictionary_id in DICTIONARIES:
+        print_row(f"dictionary {dictionary_id}", sizes(texts, dictionary_id), plain)
+    print(f"dictionary {new_id} ({len(DICTIONARIES[new_id])} bytes):")
+    print("[\n" + "".join(f"    {fragment!r},\n" for fragment in fragments) + "]")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command in [report, train, migrate]:
+        command_parser = commands.add_parser(command.__name__, help=command.__doc__)
+        command_parser.add_argument("--db", default=str(APP_DIR / "db.sqlite"))
+        if command is train:
+            command_parser.add_argument("--size", type=int, default=16 * 2 ** 10)
+    args = parser.parse_args()
+    if args.command == "train":
+        train(args.db, args.size)
+    else:
+        {"report": report, "migrate": migrate}[args.command](args.db)
@@ -6,7 +6,6 @@ from importlib import metadata
 import toml
 import toolz
 from appdirs import AppDirs
-from kivy.factory import Factory
 
 try:
     META = dict(metadata.metadata(__name__))
@@ -0,0 +1,134 @@
+"""
+Implements :class:`BatchEngine`, which processes many words concurrently.
+
+The requests of all words are made on the :const:`utils.BACKGROUND_LOOP`, such that ``N`` words times ``M`` parsers
+are in flight at the same time. The processing by the fields of the template (translation, download of media-files,
+saving to the data-base) is done in a pool of worker threads, each with its own template instance.
+"""
+import asyncio
+import contextlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List
+
+import attr
+
+from .parsers import NoMatchError, TransientError
+from .utils import BACKGROUND_LOOP
+
+
+@attr.s(auto_attribs=True)
+class BatchEngine:
+    """Process words concurrently using the parsers and fields of a template."""
+
+    template_factory: Callable
+    """Returns a new template instance. Called once per worker thread."""
+    max_in_flight: int = 8
+    """Maximal number of words that are processed at the same time."""
+    make_cards: bool = False
+    """If set, the cards are also generated from the default selection of the fields, i.e. they end up ``"done"``
+    instead of ``"ready"``. Used by ``acg batch``."""
+    on_state: Callable = None
+    """If set, called as ``on_state(word, state)`` whenever the state of a word changes."""
+    on_transient: Callable = None
+    """If set, called as ``on_transient(word)`` after a :class:`parsers.TransientError`. Should return ``True`` if
+    the word was re-scheduled. Otherwise the word is set to ``"error"``."""
+    failed_cards: List[str] = attr.ib(factory=list)
+    """Words whose search succeeded but whose card could not be generated. Only filled if :attr:`make_cards`."""
+    _executor: ThreadPoolExecutor = None
+    _slots: threading.BoundedSemaphore = None
+    _local: threading.local = attr.ib(factory=threading.local)
+
+    def __attrs_post_init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="batch"
+        )
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+
+    def template(self):
+        """Return the template instance of the current thread."""
+        if not hasattr(self._local, "template"):
+            self._local.template = self.template_factory()
+        return self._local.template
+
+    def set_state(self, word, state):
+        """Call :attr:`on_state` if set."""
+        if self.on_state:
+            self.on_state(word, state)
+
+    async def _in_thread(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    def _has_base_data(self, word):
+        return self.template().has_base_data(word)
+
+    def _search(self, word, parser_data):
+        template = self.template()
+        template.search(word, parser_data=parser_data)
+        if self.make_cards and template.has_base_data(word):
+            try:
+                template.make_card()
+            except (KeyError, ValueError, IndexError) as error:
+                template.notify(f"could not generate card for {word}: {error!r}")
+                self.failed_cards.append(word)
+                return "ready"
+            return "done"
+        return "ready"
+
+    def _set_card_state(self, word, state):
+        self.template().set_card_state(word, state)
+
+    async def process_word(self, word):
+        """
+        Fetch data for ``word`` from all parsers and process it with the fields of the template.
+
+        Returns:
+            : Final state of the word, ``"ready"`` (``"done"`` if :attr:`make_cards`), ``"queued"`` (re-scheduled) or
+            ``"error"``.
+        """
+        self.set_state(word, "loading")
+        try:
+            parser_data = None
+            if not await self._in_thread(self._has_base_data, word):
+                template = await self._in_thread(self.template)
+                parser_data = await template.fetch_parser_data(word)
+            state = await self._in_thread(self._search, word, parser_data)
+        except (NoMatchError, KeyError):
+            state = "error"
+            await self._in_thread(self._set_card_state, word, state)
+        except TransientError:
+            state = (
+                "queued" if self.on_transient and self.on_transient(word) else "error"
+            )
+            await self._in_thread(self._set_card_state, word, state)
+        except Exception as error:  # pylint: disable=broad-except
+            # any other error must not leave the word in "loading" forever
+            print(f"could not process {word}: {error!r}")
+            state = "error"
+            with contextlib.suppress(Exception):
+                await self._in_thread(self._set_card_state, word, state)
+        self.set_state(word, state)
+        return state
+
+    def submit(self, word):
+        """
+        Schedule processing of ``word`` and return a :class:`concurrent.futures.Future`.
+
+        Blocks as long as :attr:`max_in_flight` words are being processed.
+        """
+        self._slots.acquire()
+        future = BACKGROUND_LOOP.submit(self.process_word(word))
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, words):
+        """Process ``words`` and return dict ``{word: final_state}`` once all of them are done."""
+        futures = {word: self.submit(word) for word in words}
+        return {word: future.result() for word, future in futures.items()}
+
+    def shutdown(self):
+        """Shut down worker threads."""
+        self._executor.shutdown(wait=True)
@@ -1,14 +1,213 @@
 """
-This is the entry-point for pyinstaller.
+Entry-points of the command ``acg``.
 
-It makes sure that the script is called from the right path,
+Without arguments, the app is started. It makes sure that the script is called from the right path,
 such that the settings file ``ankicardgen.ini`` is placed in the folder of the main script as opposed to the folder
 from which the script is called.
+
+``acg batch`` generates cards from a word list without the GUI, e.g. on a server. It does not import kivy, uses the
+same data-base and config as the app and prints throughput and latencies of the parsers::
+
+    acg batch words.txt --concurrency=16 --apkg
 """
 
-from . import BASE_PATH
-from .main import main
+import argparse
+import configparser
+import pathlib
+import sys
+import time
+from collections import Counter
+
+from . import ANKI_DIR, BASE_PATH, CONFIG_PATH, HOME
 from .utils import CD
 
-with CD(BASE_PATH):
+WORD_LIST_FORMATS = {".txt": "txt", ".html": "kindle", ".annot": "kobo"}
+"""Format of the word list by file extension, if not given explicitly."""
+
+
+def read_config():
+    """Return :class:`configparser.ConfigParser` with the config of the app."""
+    config = configparser.ConfigParser()
+    config.read(CONFIG_PATH)
+    return config
+
+
+def read_words(path, file_format=None):
+    """Read word list with the ``word_list_from_<file_format>`` function of :mod:`word_lists`. Skip duplicates."""
+    from . import word_lists  # pylint: disable=import-outside-toplevel
+
+    file_format = file_format or WORD_LIST_FORMATS.get(pathlib.Path(path).suffix, "txt")
+    words = getattr(word_lists, f"word_list_from_{file_format}")(path)
+    return [word for word in dict.fromkeys(word.strip() for word in words) if word]
+
+
+def print_report(states, elapsed, failed_cards=()):
+    """Print throughput, final states, failed cards, parser latencies and statistics of the caches."""
+    # pylint: disable=import-outside-toplevel
+    from .lemma_cache import lemma_cache
+    from .parsers import parser_latency, response_cache, single_flight
+
+    total = sum(states.values())
+    print(
+        f"\nprocessed {total} words in {elapsed:.1f}s ({total / elapsed:.2f} words/s)"
+    )
+    print("states: " + ", ".join(f"{state}: {n}" for state, n in states.items()))
+    if failed_cards:
+        print(
+            f"could not generate {len(failed_cards)} cards: {', '.join(failed_cards)}"
+        )
+    print(
+        f"\n{'parser latency [s]':<24}{'calls':>7}{'mean':>8}{'p50':>8}{'p95':>8}{'max':>8}"
+    )
+    for name, stats in sorted(parser_latency.summary().items()):
+        print(
+            f"{name:<24}{stats['calls']:>7}"
+            + "".join(f"{stats[key]:>8.2f}" for key in ["mean", "p50", "p95", "max"])
+        )
+    print(f"\ncoalesced parser calls: {single_flight.coalesced}")
+    print(f"response cache: {response_cache.stats()}")
+    print(f"lemma cache: {lemma_cache.stats()}")
+
+
+def export(template_name, words, out_folder, config, incremental=False):
+    """Export the ``"done"`` cards of ``words`` to an apkg-file in ``out_folder``. Return its path."""
+    # pylint: disable=import-outside-toplevel
+    from pony.orm import db_session
+
+    from . import db
+    from .exporter.exporter import AnkiObject, apkg_path, changed_cards, export_apkg
+
+    states = {"done", "exported"} if incremental else {"done"}
+    with db_session:
+        card_list = [
+            card
+            for card in db.Template.get(name=template_name).get_cards()
+            if card.name in words and card.state in states
+        ]
+        if incremental:
+            card_list = changed_cards(card_list)
+        if not card_list:
+            print("no cards to export.")
+            return None
+        out_path = apkg_path(out_folder, template_name)
+        pathlib.Path(out_folder).mkdir(parents=True, exist_ok=True)
+        template_dir = config.get("Paths", "anki_template_dir", fallback="vocab_card")
+        anki_obj = AnkiObject(
+            root_dir=ANKI_DIR / template_dir,
+            **(dict(config["Anki"]) if config.has_section("Anki") else {}),
+        )
+        export_apkg(card_list, out_path, anki_obj, incremental=incremental)
+    print(f"exported {len(card_list)} cards to {out_path}")
+    return out_path
+
+
+def batch(args):
+    """Generate cards for the words in ``args.word_list`` headlessly and optionally export them."""
+    # pylint: disable=import-outside-toplevel
+    from pony.orm import db_session
+
+    from . import db
+    from .batch import BatchEngine
+    from .language_processing import nlp_manager
+    from .parsers import rate_limiter, request_policy
+    from .templates import template_cookbook
+
+    config = read_config()
+    if config.has_section("RateLimits"):
+        rate_limiter.configure(config["RateLimits"])
+    if config.has_section("Requests"):
+        request_policy.configure(config["Requests"])
+    if config.has_section("Lemmatizer"):
+        nlp_manager.configure(config["Lemmatizer"])
+    nlp_manager.multiprocessing = True
+    template_name = args.template or config.get(
+        "Template", "name", fallback="Portuguese Vocabulary (en)"
+    )
+    nlp_manager.default_language = config.get(
+        "Template", "target_language", fallback=nlp_manager.default_language
+    )
+    nlp_manager.load(nlp_manager.default_language)
+    words = read_words(args.word_list, args.format)
+    with db_session:
+        template_db = db.Template.get(name=template_name) or db.Template(
+            name=template_name
+        )
+        template_db.add_cards(words)
+        states = template_db.word_states()
+    todo = [word for word in words if states[word] not in ("done", "exported")]
+    print(f"{len(words)} words, {len(todo)} to process with template {template_name}")
+    engine = BatchEngine(
+        template_factory=lambda: template_cookbook.cook(template_name, headless=True),
+        max_in_flight=args.concurrency
+        or config.getint("Queue", "max_in_flight", fallback=8),
+        make_cards=True,
+    )
+    start = time.perf_counter()
+    try:
+        final_states = engine.run(todo)
+    finally:
+        engine.shutdown()
+    print_report(
+        Counter(final_states.values()),
+        max(time.perf_counter() - start, 1e-9),
+        engine.failed_cards,
+    )
+    if args.apkg:
+        out_folder = (
+            config.get("Paths", "apkg_export_dir", fallback=str(HOME / "ankicardgen"))
+            if args.apkg is True
+            else args.apkg
+        )
+        export(template_name, set(words), out_folder, config, args.incremental)
+
+
+def argument_parser():
+    """Return :class:`argparse.ArgumentParser` of ``acg``."""
+    parser = argparse.ArgumentParser(
+        prog="acg", description="Generate flash cards for Anki."
+    )
+    commands = parser.add_subparsers(dest="command")
+    batch_parser = commands.add_parser("batch", help=batch.__doc__)
+    batch_parser.add_argument(
+        "word_list", help="txt-, kindle- or kobo-file with the words"
+    )
+    batch_parser.add_argument(
+        "--format",
+        choices=sorted(set(WORD_LIST_FORMATS.values())),
+        help="format of the word list, by default guessed from the extension",
+    )
+    batch_parser.add_argument(
+        "--template", help="name of the template, by default the one of the app"
+    )
+    batch_parser.add_argument(
+        "--concurrency", type=int, help="number of words processed at the same time"
+    )
+    batch_parser.add_argument(
+        "--apkg",
+        nargs="?",
+        const=True,
+        metavar="DIR",
+        help="export the generated cards, by default to the export-directory of the app",
+    )
+    batch_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="with --apkg, only export cards that changed since their last export",
+    )
+    return parser
+
+
+def main(argv=None):
+    """Start the app, or run the sub-command given in ``argv`` (default ``sys.argv[1:]``)."""
+    args = argument_parser().parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "batch":
+        batch(args)
+        return
+    from .main import main as run_app  # pylint: disable=import-outside-toplevel
+
+    with CD(BASE_PATH):
+        run_app()
+
+
+if __name__ == "__main__":
     main()
@@ -0,0 +1,99 @@
+"""
+Compression of the json-columns :attr:`db.Card.base_data` and :attr:`db.Card.fields`.
+
+The json is compressed by :mod:`zlib` with a preset dictionary of strings that occur in almost every card: keys of the
+parser results, names of the fields and the markup of the conjugation tables. Single cards are too small for zlib to
+find much repetition on its own, the dictionary provides it.
+
+The first byte of a compressed value is the id of its dictionary in :const:`DICTIONARIES`. Values compressed with
+an older dictionary can therefore still be read. Dictionaries must never be changed once released, add a new one
+instead and set :const:`CURRENT_DICTIONARY`. Candidates can be trained and evaluated with
+``.utils/compression_report.py``.
+"""
+import json
+import zlib
+
+DICTIONARIES = {
+    0: b"",
+    1: "".join(
+        [
+            "https://encrypted-tbn0.gstatic.com/images?q=tbn:",
+            "https://",
+            ".jpg",
+            ".mp3",
+            '"thumbnail": ["',
+            '"image_search_keywords": ',
+            '"word_type": ',
+            '"gender": ',
+            '"gender_per_translation": [',
+            '"antonym": [',
+            '"antonym_trans": [',
+            '"synonym": [',
+            '"synonym_trans": [',
+            '"explanation": [',
+            '"explanation_trans": [',
+            '"additional_info": ',
+            '"conjugation_table": "',
+            "Pret\\u00e9rito Imperfeito",
+            "Pret\\u00e9rito Perfeito",
+            "Pret\\u00e9rito Mais-que-perfeito",
+            "Futuro do Pret\\u00e9rito",
+            "Futuro",
+            "Presente",
+            '<table border=\\"1\\" class=\\"dataframe subj\\">\\n',
+            '<table border=\\"1\\" class=\\"dataframe ind\\">\\n',
+            "  <thead>\\n",
+            '    <tr style=\\"text-align: right;\\">\\n',
+            "      <th>",
+            "</th>\\n    </tr>\\n  </thead>\\n  <tbody>\\n",
+            "  </tbody>\\n</table>\\n",
+            "    <tr>\\n      <td>",
+            "</td>\\n    </tr>\\n",
+            '"audio": "',
+            '"image": ["',
+            '"word": "',
+            '"translation": ["',
+            '"example": ["',
+            '"example_trans": [',
+            "null, ",
+            '", "',
+        ]
+    ).encode(),
+}
+"""Preset dictionaries by id. The most frequent strings are at the end, as zlib encodes near matches shorter."""
+
+CURRENT_DICTIONARY = 1
+"""Id of the dictionary used to compress new values."""
+
+LEVEL = 9
+"""Compression level of :mod:`zlib`."""
+
+
+def compress(data, dictionary=CURRENT_DICTIONARY):
+    """Return ``data`` (bytes) compressed with dictionary number ``dictionary``, prefixed by the dictionary id."""
+    zdict = DICTIONARIES[dictionary]
+    compressor = (
+        zlib.compressobj(LEVEL, zdict=zdict) if zdict else zlib.compressobj(LEVEL)
+    )
+    return bytes([dictionary]) + compressor.compress(data) + compressor.flush()
+
+
+def decompress(blob):
+    """Return the bytes compressed to ``blob`` by :func:`compress`."""
+    zdict = DICTIONARIES[blob[0]]
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return decompressor.decompress(blob[1:]) + decompressor.flush()
+
+
+def compress_json(value):
+    """Return ``value`` serialized to json and compressed. ``None`` is kept as ``None``."""
+    if value is None:
+        return None
+    return compress(json.dumps(value).encode())
+
+
+def decompress_json(blob):
+    """Inverse of :func:`compress_json`."""
+    if blob is None:
+        return None
+    return json.loads(decompress(blob))
@@ -23,11 +23,20 @@ from .scroll_widgets import (
 from .selection_widgets import CheckChipContainer, LongPressImage, TransCard
 
 # selection_widgets
-from .settings import PathSection, SectionBase, SettingsWidget, ThemeSection
+from .settings import (
+    PathSection,
+    SectionBase,
+    SettingsWidget,
+    TextSection,
+    TextSetting,
+    ThemeSection,
+)
+from .template_layout import TemplateLayout
 
 Factory.register("LongPressImage", LongPressImage)
 Factory.register("TransCard", TransCard)
 Factory.register("CustomSpeedDial", CustomSpeedDial)
+Factory.register("TemplateLayout", TemplateLayout)
 # scroll_widgets
 Factory.register("ScrollBox", ScrollBox)
 Factory.register("ScrollGrid", ScrollGrid)
@@ -49,6 +58,8 @@ Factory.register("SettingsWidget", SettingsWidget)
 Factory.register("PathSection", PathSection)
 Factory.register("ThemeSection", ThemeSection)
 Factory.register("SectionBase", SectionBase)
+Factory.register("TextSection", TextSection)
+Factory.register("TextSetting", TextSetting)
 
 for kv_file in pathlib.Path(__file__).parent.glob("**/*.kv"):
     Builder.unload_file(str(kv_file))
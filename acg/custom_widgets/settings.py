@@ -79,6 +79,14 @@ class PathChooser(KeyBase, BoxLayout):
             file_manager.show(path=path)
 
 
+class TextSetting(KeyBase, BoxLayout):
+    """Key (as Label) and text-field to edit the value. The value is updated on enter."""
+
+    def on_text_validate(self, text):
+        """Call :meth:`dispatch_update` with the new text as val."""
+        self.dispatch_update(text)
+
+
 class SettingsWidget(BoxLayout):
     """Base-class for SettingsRoot screen."""
 
@@ -130,6 +138,23 @@ class PathSection(ChildrenFromDataBehavior, SectionBase):
         super().__init__(**kwargs)
 
 
+class TextSection(ChildrenFromDataBehavior, SectionBase):
+    """Section of the config where every value can be edited as text."""
+
+    child_class_name = "TextSetting"
+
+    def _get_data(self):
+        return [
+            {"key": key, "val": val} for key, val in self.config[self.section].items()
+        ]
+
+    data = AliasProperty(getter=_get_data, bind=["config", "_config_update"])
+
+    def __init__(self, **kwargs):
+        self.child_bindings = {"on_update": self.update_config}
+        super().__init__(**kwargs)
+
+
 # pylint: disable = W,C,R,I,E
 if __name__ == "__main__":
     from .. import CONFIG_PATH
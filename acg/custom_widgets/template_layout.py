@@ -0,0 +1,16 @@
+"""Implements :class:`TemplateLayout`, which shows the widgets of a :class:`templates.Template`."""
+from kivy.uix.boxlayout import BoxLayout
+
+from .selection_widgets import SeparatorWithHeading
+
+
+class TemplateLayout(BoxLayout):
+    r"""Widget containing the widgets of the :class:`fields.Field`\ s of a :class:`templates.Template`."""
+
+    def add_field_widgets(self, fields):
+        """Add the widget of each field that has one, preceded by its heading if set."""
+        for field in fields:
+            if field.widget:
+                if field.heading:
+                    self.add_widget(SeparatorWithHeading(heading=field.heading))
+                self.add_widget(field.widget)
@@ -3,6 +3,8 @@ The app uses :mod:`pony` to manage a sqlite-database. The database is structured
 
 .. image:: ../docs/ponyorm_diagram.png
 """
+import hashlib
+import json
 from datetime import datetime
 
 import toolz
@@ -13,21 +15,39 @@ from pony.orm import (
     PrimaryKey,
     Required,
     Set,
-    buffer,
+    composite_key,
+    count,
     db_session,
+    exists,
     select,
 )
 
 from . import APP_DIR
+from .compression import compress_json, decompress_json
+from .media_store import media_store
+from .migrations import migrate
+from .sqlite_profile import apply_pragmas, configured_pragmas
 from .utils import CD, update_word_state_dict
 
 db = Database()
 db_path = APP_DIR / "db.sqlite"
+pragmas, invalid_pragmas = configured_pragmas()
+MEDIA_GARBAGE_MIN_AGE = 3600
+"""Seconds after which unreferenced files of the media-store are removed by :func:`collect_media_garbage`."""
+
+
+@db.on_connect(provider="sqlite")
+def set_pragmas(_, connection):
+    """Apply the pragmas of :mod:`sqlite_profile` to each new connection."""
+    apply_pragmas(connection, pragmas)
+
+
 db.bind(
     provider="sqlite",
     filename=str(db_path),
     create_db=not db_path.exists(),
 )
+migrate(db_path)
 
 
 class Template(db.Entity):
@@ -46,9 +66,8 @@ class Template(db.Entity):
 
     @db_session
     def get_card(self, name):
-        """Get a single :class:`Card` by name. (unique attribute)."""
-        cards_by_name = select(c for c in self.cards if c.name == name)
-        return toolz.first(cards_by_name) if cards_by_name else None
+        """Get a single :class:`Card` by name. (unique per template, looked up by index)."""
+        return Card.get(template=self, name=name)
 
     @db_session
     def get_cards(self, selector=None):
@@ -57,12 +76,42 @@ class Template(db.Entity):
             return select(c for c in self.cards if selector(c))
         return select(c for c in self.cards)
 
+    @db_session
+    def word_states(self):
+        """Return dict ``{card_name: state}``. Only these two columns are loaded."""
+        query = select((c.name, c.state) for c in Card if c.template == self)
+        return dict(query.without_distinct())
+
+    @db_session
+    def has_base_data(self, name):
+        """Return ``True`` if the card ``name`` has base_data. Checked in SQL, without loading the compressed blob."""
+        return exists(
+            c.id
+            for c in Card
+            if c.template == self
+            and c.name == name
+            and c.compressed_base_data is not None
+        )
+
     @db_session
     def add_card(self, name):
         """Create a new :class:`Card` with relation to this template."""
         card = Card(name=name, state="waiting", template=self)
         return card
 
+    @db_session
+    def add_cards(self, names):
+        """
+        Create a :class:`Card` in ``"waiting"`` state for each of ``names`` that has none yet. Return the new names.
+
+        Existing names are fetched by one query and all cards are inserted on commit of the same transaction.
+        """
+        existing = set(select(c.name for c in Card if c.template == self))
+        new_names = [name for name in dict.fromkeys(names) if name not in existing]
+        for name in new_names:
+            Card(name=name, state="waiting", template=self)
+        return new_names
+
     @classmethod
     @db_session
     def names(cls):
@@ -76,13 +125,18 @@ class Card(db.Entity):
     id = PrimaryKey(int, auto=True)
     name = Required(str)
     state = Required(str)
-    base_data = Optional(Json)
-    fields = Optional(Json)
+    compressed_base_data = Optional(bytes, lazy=True, column="base_data")
+    """:attr:`base_data` compressed by :mod:`compression`. Loaded on first access, as it can be large."""
+    compressed_fields = Optional(bytes, lazy=True, column="fields")
+    """:attr:`fields` compressed by :mod:`compression`. Loaded on first access, as it can be large."""
     media_files = Set("MediaFile")
     dt_queried = Optional(datetime)
     dt_generated = Optional(datetime)
     dt_exported = Optional(datetime)
+    exported_hash = Optional(str)
+    """:meth:`content_hash` at the time of the last export."""
     template = Required(Template)
+    composite_key(template, name)
 
     def __setattr__(self, key, value):
         """Change state according to values set."""
@@ -96,6 +150,24 @@ class Card(db.Entity):
         if key == "state":
             update_word_state_dict(self.name, self.state)
 
+    @property
+    def base_data(self):
+        """Data obtained by the parsers."""
+        return decompress_json(self.compressed_base_data)
+
+    @base_data.setter
+    def base_data(self, value):
+        self.compressed_base_data = compress_json(value)
+
+    @property
+    def fields(self):
+        """Content of the fields of the anki-card."""
+        return decompress_json(self.compressed_fields)
+
+    @fields.setter
+    def fields(self, value):
+        self.compressed_fields = compress_json(value)
+
     @db_session
     def get_media(self, field_key):
         """Get :class:`MediaFile` of this card by ``field_key`` which is unique."""
@@ -104,10 +176,28 @@ class Card(db.Entity):
 
     @db_session
     def add_media(self, **kwargs):
-        """Add a new :class:`MediaFile` to this card."""
-        media_file = MediaFile(**kwargs, card=self)
+        """Add a new :class:`MediaFile` to this card. A ``content`` keyword is saved in the media-store."""
+        media_file = MediaFile(**MediaFile.store_content(kwargs), card=self)
         return media_file
 
+    def content_hash(self):
+        """Return hash of :attr:`fields`."""
+        fields_string = json.dumps(self.fields, sort_keys=True)
+        return hashlib.sha256(fields_string.encode()).hexdigest()
+
+    @db_session
+    def media_hashes(self, only_new=False):
+        """
+        Return dict ``{file_name: sha256}`` of :attr:`media_files`, named as referenced on the anki-card.
+
+        If ``only_new``, skip media-files that have been exported before with the same content.
+        """
+        return {
+            f"{self.name}.{m.type}": m.sha256
+            for m in self.media_files
+            if not only_new or m.exported_sha256 != m.sha256
+        }
+
     @db_session
     def write_media_files_to_folder(self, folder="."):
         """Write media-files in :attr:`media_files` to folder with name `folder`."""
@@ -115,12 +205,15 @@ class Card(db.Entity):
         for m_file in media_files:
             name = f"{self.name}.{m_file.type}"
             with CD(folder):
-                with open(name, "wb") as file:
-                    file.write(m_file.content)
+                media_store.copy(m_file.sha256, name)
 
 
 class MediaFile(db.Entity):
-    """Class containing a media-file."""
+    """
+    Class referencing a media-file in :const:`media_store.media_store`.
+
+    The file itself is accessed via :attr:`content`.
+    """
 
     id = PrimaryKey(int, auto=True)
     """Unique id."""
@@ -128,21 +221,71 @@ class MediaFile(db.Entity):
     """File type, e.g. "mp3", "jpg", "png", etc. ..."""
     field_key = Required(str)
     """Name of the field of the card which the content belongs to."""
-    content = Required(buffer)
-    """Bytes object with media-file."""
+    sha256 = Required(str, index=True)
+    """Hash of the content, i.e. name of the file in the media-store."""
+    size = Required(int)
+    """Size of the content in bytes."""
+    exported_sha256 = Optional(str)
+    """:attr:`sha256` at the time of the last export."""
     card = Required(Card)
     """Relation to :class:`Card` object."""
 
+    @property
+    def content(self):
+        """Bytes object with media-file. Setting it saves the bytes in the media-store."""
+        return media_store.get(self.sha256)
+
+    @content.setter
+    def content(self, value):
+        self.sha256, self.size = media_store.put(bytes(value))
+
+    @staticmethod
+    def store_content(kwargs):
+        """Return ``kwargs`` with ``content`` replaced by ``sha256`` and ``size`` of the file in the media-store."""
+        kwargs = dict(kwargs)
+        if "content" in kwargs:
+            kwargs["sha256"], kwargs["size"] = media_store.put(
+                bytes(kwargs.pop("content"))
+            )
+        return kwargs
+
     @db_session
     def update(self, **kwargs):
         """Update attributes by ``*kwargs``."""
-        for key, val in kwargs.items():
+        for key, val in self.store_content(kwargs).items():
             setattr(self, key, val)
 
 
 db.generate_mapping(create_tables=True)
 
 
+@db_session
+def media_references():
+    """Return dict ``{sha256: number of media-files referencing it}``."""
+    return dict(select((m.sha256, count(m)) for m in MediaFile))
+
+
+def collect_media_garbage(min_age=MEDIA_GARBAGE_MIN_AGE):
+    """
+    Remove files from the media-store that are not referenced by any :class:`MediaFile`.
+
+    Files stored less than ``min_age`` seconds ago are kept, as their media-files may not be committed yet, e.g. by an
+    ``acg batch`` running at the same time.
+
+    Returns:
+        : Tuple of the number of removed files and the freed bytes.
+    """
+    references = media_references()
+    removed = []
+    for sha256 in list(media_store.hashes()):
+        try:
+            if sha256 not in references and media_store.age(sha256) >= min_age:
+                removed.append(media_store.remove(sha256))
+        except FileNotFoundError:
+            continue
+    return len(removed), sum(removed)
+
+
 # pylint: disable = W,C,R,I
 if __name__ == "__main__":
     from . import ANKI_DIR
@@ -0,0 +1,33 @@
+"""Registers the export-chains shown in the speed-dial of the history-screen in :const:`export_cookbook`."""
+from functools import partial
+
+from ..design_patterns.callback_chain import CallChain
+from ..design_patterns.factory import CookBook
+from ..importer import CheckChipDialogNode
+from .exporter import export_cards, get_cards
+
+export_cookbook = CookBook()
+
+export_cookbook.register(
+    "export_select",
+    nodes=[get_cards, CheckChipDialogNode(), export_cards],
+    info={"icon": "check-box-multiple-outline", "text": "select cards to export"},
+)(CallChain)
+export_cookbook.register(
+    "export_all",
+    nodes=[partial(get_cards, state={"done", "exported"}), export_cards],
+    info={"icon": "content-save-all", "text": "export all cards"},
+)(CallChain)
+export_cookbook.register(
+    "export_changed",
+    nodes=[
+        partial(get_cards, state={"done", "exported"}),
+        partial(export_cards, incremental=True),
+    ],
+    info={"icon": "update", "text": "export changed cards"},
+)(CallChain)
+export_cookbook.register(
+    "export_new",
+    nodes=[partial(get_cards, state={"done"}), export_cards],
+    info={"icon": "new-box", "text": "export new cards"},
+)(CallChain)
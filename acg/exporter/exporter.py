@@ -1,5 +1,5 @@
 """
-Implements :class:`AnkiObject` and :class:`ApkgExporter`.
+Implements :class:`AnkiObject` and :class:`StorePackage`.
 
 Relies heavily on `genanki <https://github.com/kerrickstaley/genanki>`_.
 
@@ -10,18 +10,24 @@ Its purpose is to handle everything Anki-related:
 """
 
 
+import copy
+import hashlib
+import io
+import json
+import os
 import pathlib
 import re
+import zipfile
 from datetime import datetime
 
 import attr
 import bs4
 import genanki
-from kivymd.app import MDApp
-from kivymd.toast import toast
 from pony.orm import db_session
 
-from ..utils import CD, cd_temp_dir, now_string, set_word_state
+from .. import APP_DIR
+from ..media_store import media_store
+from ..utils import CD, now_string, running_app, toast
 from . import EXPORTER_DIR
 
 
@@ -123,6 +129,132 @@ def model_from_html(name, template_names, model_id, css_path):
     )
 
 
+@attr.s(auto_attribs=True)
+class ModelCache:
+    """
+    Persistent cache of the fields, templates and css of the models built by :func:`model_from_html`.
+
+    Entries are keyed by the template directory, the arguments of :func:`model_from_html` and the paths, sizes and
+    modification times of all files in the directory, such that any change of a template invalidates its entry.
+    """
+
+    path: pathlib.Path = APP_DIR / "model_cache.json"
+    """Location of the json-file."""
+    max_entries: int = 16
+    """Maximal number of stored models. The oldest entries are dropped first."""
+    _entries: dict = None
+
+    @staticmethod
+    def key(root_dir, **kwargs):
+        """Return key for the model built in ``root_dir`` with ``kwargs``."""
+        root_dir = pathlib.Path(root_dir).absolute()
+        files = []
+        for path in sorted(root_dir.rglob("*")):
+            if path.is_file():
+                stat = path.stat()
+                files.append(
+                    [str(path.relative_to(root_dir)), stat.st_size, stat.st_mtime_ns]
+                )
+        key_string = json.dumps([str(root_dir), kwargs, files], sort_keys=True)
+        return hashlib.sha256(key_string.encode()).hexdigest()
+
+    @property
+    def entries(self):
+        """Load entries from :attr:`path` on first access."""
+        if self._entries is None:
+            try:
+                with open(self.path) as file:
+                    self._entries = json.load(file)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key):
+        """Return dict with the keys ``fields``, ``templates`` and ``css`` or ``None``."""
+        return self.entries.get(key)
+
+    def put(self, key, spec):
+        """Save ``spec`` under ``key`` and write :attr:`path`."""
+        self.entries[key] = spec
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        temp_path = self.path.with_suffix(".tmp")
+        with open(temp_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(temp_path, self.path)
+
+
+model_cache = ModelCache()
+"""Process-wide instance used by :class:`AnkiObject`."""
+
+
+def cached_model_from_html(root_dir, name, template_names, model_id, css_path):
+    """Like :func:`model_from_html` with the paths relative to ``root_dir``, but use :const:`model_cache`."""
+    key = model_cache.key(
+        root_dir,
+        name=name,
+        template_names=template_names,
+        model_id=model_id,
+        css_path=css_path,
+    )
+    spec = model_cache.get(key)
+    if spec is None:
+        with CD(root_dir):
+            model = model_from_html(name, template_names, model_id, css_path)
+        spec = {"fields": model.fields, "templates": model.templates, "css": model.css}
+        model_cache.put(key, copy.deepcopy(spec))
+    else:
+        # genanki adds keys to the dicts of fields and templates when writing, so every model gets its own copy
+        spec = copy.deepcopy(spec)
+    return genanki.Model(model_id=model_id, name=name, **spec)
+
+
+class StorePackage(genanki.Package):
+    """
+    :class:`genanki.Package` that streams media-files from :const:`media_store.media_store` into the apkg-file.
+
+    Besides the paths in :attr:`media_files`, the files in :attr:`store_media` are added without writing copies to a
+    temporary directory first.
+    """
+
+    def __init__(self, deck_or_decks=None, media_files=None):
+        super().__init__(deck_or_decks, media_files)
+        self.store_media = {}
+        """Dict of the form ``{"file_name_on_card": sha256}``."""
+
+    def media_entries(self):
+        """Return list of tuples ``(file_name_on_card, path)`` of all media-files."""
+        return [(os.path.basename(path), path) for path in self.media_files] + [
+            (name, media_store.file_path(sha256))
+            for name, sha256 in self.store_media.items()
+        ]
+
+    def write_to_file(self, file, *args, **kwargs):
+        """
+        Write apkg-file to ``file``.
+
+        The collection is generated by :meth:`genanki.Package.write_to_file` in memory. The media-files are then
+        copied chunk-wise from their location into the zip-file.
+        """
+        collection = io.BytesIO()
+        media_files, self.media_files = self.media_files, []
+        try:
+            super().write_to_file(collection, *args, **kwargs)
+        finally:
+            self.media_files = media_files
+        entries = self.media_entries()
+        with zipfile.ZipFile(collection) as in_zip, zipfile.ZipFile(
+            file, "w"
+        ) as out_zip:
+            out_zip.writestr("collection.anki2", in_zip.read("collection.anki2"))
+            out_zip.writestr(
+                "media",
+                json.dumps({idx: name for idx, (name, _) in enumerate(entries)}),
+            )
+            for idx, (_, path) in enumerate(entries):
+                out_zip.write(path, str(idx))
+
+
 @attr.s
 class AnkiObject:  # pylint: disable=too-many-instance-attributes
     """
@@ -143,39 +275,47 @@ class AnkiObject:  # pylint: disable=too-many-instance-attributes
     id = attr.ib(default=12345)
 
     def __attrs_post_init__(self):
-        with CD(self.root_dir):
-            self.model = model_from_html(
-                self.model_name,
-                self.templates,
-                css_path=self.css_path,
-                model_id=self.id,
-            )
-            self.deck = genanki.Deck(self.id, name=self.deck_name)
-            self.package = genanki.Package(self.deck)
-            self.fields = [
-                field
-                for field_dict in self.model.fields
-                for field in field_dict.values()
-            ]
-
-    def add_card(self, media_files=None, **kwargs):
+        self.model = cached_model_from_html(
+            self.root_dir,
+            self.model_name,
+            self.templates,
+            css_path=self.css_path,
+            model_id=self.id,
+        )
+        self.deck = genanki.Deck(self.id, name=self.deck_name)
+        self.package = StorePackage(self.deck)
+        self.fields = [
+            field for field_dict in self.model.fields for field in field_dict.values()
+        ]
+
+    def add_card(self, media_files=None, stored_media=None, guid=None, **kwargs):
         """
-        Add card constructed from ``**kwargs`` to :attr:`deck` and ``media_files`` to :attr:`package.media_files`.
+        Add card constructed from ``**kwargs`` to :attr:`deck` and ``media_files`` to :attr:`package`.
 
         Args:
           media_files (List[str]): Media files used on card.  (Default value = None)
+          stored_media (Dict[str, str]): Maps names in ``media_files`` to hashes in :const:`media_store.media_store`.
+            Those files are taken from the store, the other ones are interpreted as paths.  (Default value = None)
+          guid (str): GUID of the note. Anki updates an existing note with the same GUID on import. Defaults to a
+            hash of the fields.  (Default value = None)
           **kwargs: In the form: ``field_name="content"``.
 
         """
         if media_files is None:
             media_files = []
+        stored_media = stored_media or {}
         fields = {
             field: (kwargs[field] if field in kwargs else "") for field in self.fields
         }
         fields = [fields[key] for key in sorted(fields, reverse=True)]
-        new_note = genanki.Note(model=self.model, fields=fields, sort_field="word")
+        new_note = genanki.Note(
+            model=self.model, fields=fields, sort_field="word", guid=guid
+        )
         for file in media_files:
-            self.package.media_files.append(file)
+            if file in stored_media:
+                self.package.store_media[file] = stored_media[file]
+            else:
+                self.package.media_files.append(file)
         self.deck.add_note(new_note)
 
     def write_apkg(self, out_path):
@@ -192,51 +332,105 @@ def get_cards(state=None):
     """Get words from word_state_dict filtered, possibly filtered by state."""
     return {
         key
-        for key, val in MDApp.get_running_app().word_state_dict.items()
+        for key, val in running_app().word_state_dict.items()
         if not state or val in state
     }
 
 
 @db_session
-def export_cards(card_names):
-    """Export cards to <template_name>_<time-stamp>.apkg file in apgk_export_dir."""
+def export_cards(card_names, incremental=False):
+    """
+    Export cards to <template_name>_<time-stamp>.apkg file in apgk_export_dir.
+
+    If ``incremental``, only changed cards and new media-files are exported, see :func:`write_apkg`.
+    """
     if not card_names:
         toast("Empty selection.", duration=5)
         return
-    config = MDApp.get_running_app().config
-    template_dir = config["Paths"]["anki_template_dir"]
-    anki_config = config["Anki"]
-    anki_obj = AnkiObject(root_dir=template_dir, **anki_config)
-    template_name = config["Template"]["name"]
-    out_file = f'{template_name.replace(" ","_")}_{now_string()}.apkg'
+    config = running_app().config
     out_folder = config["Paths"]["apkg_export_dir"]
-    out_path = pathlib.Path(out_folder) / out_file
-    toast(f"Exporting cards to {out_folder}...", duration=5)
     card_list = [
         card
-        for card in MDApp.get_running_app().get_current_template_db().get_cards()
+        for card in running_app().get_current_template_db().get_cards()
         if card.name in card_names
     ]
-    write_apkg(anki_obj, card_list, out_path)
+    if incremental:
+        card_list = changed_cards(card_list)
+        if not card_list:
+            toast("No changes since last export.", duration=5)
+            return
+    toast(f"Exporting cards to {out_folder}...", duration=5)
+    export_apkg(
+        card_list,
+        apkg_path(out_folder, config["Template"]["name"]),
+        anki_obj=AnkiObject(
+            root_dir=config["Paths"]["anki_template_dir"], **config["Anki"]
+        ),
+        incremental=incremental,
+    )
+
+
+def apkg_path(out_folder, template_name):
+    """Return path of the file ``<template_name>_<time-stamp>.apkg`` in ``out_folder``."""
+    out_file = f'{template_name.replace(" ","_")}_{now_string()}.apkg'
+    return pathlib.Path(out_folder) / out_file
+
+
+def export_apkg(card_list, out_path, anki_obj, incremental=False):
+    """Write ``card_list`` to the apkg-file ``out_path`` with :func:`write_apkg` and mark the cards as exported."""
+    write_apkg(anki_obj, card_list, out_path, incremental=incremental)
     set_cards_exported(card_list)
 
 
-def write_apkg(anki_obj, card_list, out_path):
-    """Write apkg to ``out_path``."""
-    with cd_temp_dir():
-        for card in card_list:
-            card.write_media_files_to_folder()
-            anki_obj.add_card(**card.fields)
-        anki_obj.write_apkg(out_path)
+def changed_cards(card_list):
+    """
+    Return cards whose content changed since their last export.
+
+    That is, their fields changed or one of their media-files was not exported with its current content, e.g. a new
+    image with the same file name.
+    """
+    return [
+        card
+        for card in card_list
+        if card.exported_hash != card.content_hash() or card.media_hashes(only_new=True)
+    ]
+
+
+def note_guid(card):
+    """Return GUID of the anki-note of ``card``, which only depends on the names of card and template."""
+    return genanki.guid_for(card.template.name, card.name)
+
+
+def write_apkg(anki_obj, card_list, out_path, incremental=False):
+    """
+    Write apkg to ``out_path``. The media-files are streamed from the media-store.
+
+    The notes get stable GUIDs from :func:`note_guid`, such that Anki updates notes that were imported before. If
+    ``incremental``, media-files that have been exported before with the same content are left out.
+    """
+    for card in card_list:
+        fields = dict(card.fields)
+        stored_media = card.media_hashes()
+        if incremental:
+            new_media = card.media_hashes(only_new=True)
+            fields["media_files"] = [
+                name
+                for name in fields.get("media_files") or []
+                if name not in stored_media or name in new_media
+            ]
+        anki_obj.add_card(stored_media=stored_media, guid=note_guid(card), **fields)
+    anki_obj.write_apkg(out_path)
 
 
 def set_cards_exported(card_list):
-    """Set state to ``"exported"``."""
+    """Set state to ``"exported"`` and remember the exported content of cards and media-files."""
     now = datetime.now()
     for card in card_list:
         card.state = "exported"
         card.dt_exported = now
-        set_word_state(word=card.name, state="exported")
+        card.exported_hash = card.content_hash()
+        for media_file in card.media_files:
+            media_file.exported_sha256 = media_file.sha256
 
 
 # pylint: disable = W,C,R,I
@@ -7,14 +7,12 @@ customization of :class:`templates.Template`.
 from typing import Callable
 
 import attr
-import requests
 from bidict import bidict
-from kivy.clock import mainthread
-from kivy.lang import Builder
 from pony.orm import db_session
 
 from .design_patterns.factory import CookBook
-from .utils import compress_img_bytes
+from .parsers import media_downloader
+from .utils import compress_img_bytes, mainthread
 
 field_cookbook = CookBook()
 
@@ -86,7 +84,7 @@ class Field:
     widget = attr.ib(type=object, default=None)
     """Gets constructed by :meth:`~kivy.lang.Builder.load_string` from :attr:`widget_kv` if set."""
     widget_kv = attr.ib(type=str, default=None)
-    """If set, widget gets constructed."""
+    """If set, widget gets constructed, unless the template is ``headless``."""
     _kv_bidict = attr.ib()
     """Mapping between attributes of kivy-widget and field_name."""
 
@@ -108,7 +106,7 @@ class Field:
 
     def __attrs_post_init__(self):
         self.pre_process()
-        if self.widget_kv:
+        if self.widget_kv and not self.template.headless:
             self.construct_widget()
 
     def pre_process(self):
@@ -129,13 +127,16 @@ class Field:
 
     def construct_widget(self):
         """Construct widget that is used for the selection of :attr:`content`."""
+        from kivy.lang import Builder  # pylint: disable=import-outside-toplevel
+
         self.widget = Builder.load_string(self.widget_kv)
         self.update_widget_data()
 
     def update(self):
-        """Apply :meth:`pre_process` and :meth:`update_widget_data`."""
+        """Apply :meth:`pre_process` and, if there is a :attr:`widget`, :meth:`update_widget_data`."""
         self.pre_process()
-        self.update_widget_data()
+        if self.widget:
+            self.update_widget_data()
 
     @mainthread
     def update_widget_data(self):
@@ -239,7 +240,8 @@ class OptionsField(Field):
 
         If :attr:`selection_callback` is set, get content from call.
 
-        Else simply get the first option as default.
+        Else simply get the first option of each key of :attr:`kv_bidict` as default, e.g. if the template is
+        ``headless``.
         """
         if self.widget_kv and hasattr(self.widget, "get_checked"):
             content = {
@@ -255,16 +257,14 @@ class OptionsField(Field):
         elif self.get_selection:
             content = self.get_selection()
         else:
-            options = self.template.data[self.field_name]
-            content = {
-                self.field_name: (
-                    options[0]
-                    if isinstance(options, list) and len(options) >= 1
-                    else options
-                )
-            }
+            content = {key: self.first_option(key) for key in self.kv_bidict}
         return self.post_process(content)
 
+    def first_option(self, key):
+        """Return the first option of ``key`` in :attr:`template`.data, ``""`` if there is none."""
+        options = self.template.data.get(key) or ""
+        return options[0] if isinstance(options, list) else options
+
 
 @attr.s(auto_attribs=True)
 class CheckChipOptionsField(OptionsField):
@@ -317,15 +317,28 @@ class MediaField(Field):
         media = self.template.current_card_db().get_media(self.field_name)
         if not media:
             return False
-        return bool(media.content)
+        return bool(media.size)
 
     @staticmethod
     def get_media_file(url):
-        """Download file using :meth:`requests.get`."""
-        print(f"downloading file from {url}...")
-        response = requests.get(url)
-        print("done." if response.ok else "download failed :(")
-        return response.content if response.ok else None
+        """Download file via :const:`parsers.media_downloader`. Returns ``None`` if the download failed."""
+        return media_downloader.get(url)
+
+    def url(self):
+        """Return the url in :attr:`template`.data if it is a single one, else ``None``."""
+        url = (
+            self.template.data[self.field_name]
+            if self.template.data and self.field_name in self.template.data
+            else None
+        )
+        return url if url and isinstance(url, str) else None
+
+    @db_session
+    def prefetch(self):
+        """Start download of the file in the background, unless it is already saved in the db."""
+        url = self.url()
+        if url and not self.content_exists():
+            media_downloader.prefetch(url)
 
     def get_file_strings(self):
         """Get string that embeds the file in the anki-card."""
@@ -357,12 +370,8 @@ class MediaField(Field):
     @db_session
     def pre_process(self):
         """Obtain url, download and save file."""
-        url = (
-            self.template.data[self.field_name]
-            if self.template.data and self.field_name in self.template.data
-            else None
-        )
-        if url and isinstance(url, str):
+        url = self.url()
+        if url:
             if not self.content_exists():
                 media_file = self.get_media_file(url)
                 if media_file:
@@ -1,10 +1,9 @@
 """ImportChains."""
-from collections import defaultdict
+from functools import partial
 from typing import Callable
 
 import attr
 import toolz
-from bs4 import BeautifulSoup
 from kivy.factory import Factory
 from kivy.lang import Builder
 from kivymd.app import MDApp
@@ -14,36 +13,15 @@ from pony.orm import db_session
 from .custom_widgets.dialogs import CustomDialog
 from .design_patterns.callback_chain import CallChain, CallNode, PrinterNode
 from .design_patterns.factory import CookBook
-from .language_processing import lemma_dict, remove_punctuation
-from .utils import get_file_manager, pop_unchanged
-
-COLOR2MEANING = {
-    "highlight_yellow": "words",
-    "highlight_blue": "phrases",
-    "highlight_pink": "sentences",
-    "highlight_orange": "",
-}
-MEANING2COLOR = {val: key for key, val in COLOR2MEANING.items()}
-
-
-def dict_from_kindle_export(file_path):
-    """
-    Extract highlighted parts and sorts them by color in a dictionary.
-
-    Args:
-      file_path: Path to an html-file exported from kindle.
-
-    Returns:
-        :Dictionary `{"highlight_color_1" : ["list", "of" , "highlighted parts", ...],...}`
-    """
-    with open(file_path) as file:
-        soup = BeautifulSoup(file, "lxml")
-    heading_tags = soup.select("div.noteHeading span")
-    highlight_dict = defaultdict(list)
-    for tag in heading_tags:
-        highlight_dict[tag["class"][0]].append(tag.find_next().text.strip())
-    return highlight_dict
-
+from .language_processing import lemma_dict, nlp_manager, remove_punctuation
+from .utils import (
+    get_file_manager,
+    mainthread,
+    pop_unchanged,
+    toast,
+    update_word_states,
+)
+from .word_lists import word_list_from_kindle, word_list_from_kobo, word_list_from_txt
 
 node_cookbook = CookBook()
 import_chain_cookbook = CookBook()
@@ -76,12 +54,21 @@ def clean_words(words: list):
 class Lemmatizer(CallNode):
     """Send dictionary with suggested replacements and list of unchanged words to next node."""
 
-    language: str = "pt"
+    language: str = None
+    """Language of the spacy pipeline. Defaults to ``target_language`` of the app."""
     is_new: Callable = lambda item: True
 
     def process(self, words: list):  # pylint: disable=arguments-differ
+        """Wait for the spacy pipeline without blocking the ui, then call :meth:`send_lemmas`."""
+        if not nlp_manager.is_ready(self.language):
+            toast("loading language model...")
+        nlp_manager.when_ready(
+            mainthread(partial(self.send_lemmas, words)), self.language
+        )
+
+    def send_lemmas(self, words, nlp):
         """Send dictionary with suggested replacements and list of unchanged words to next node."""
-        lemmas = lemma_dict(words)
+        lemmas = lemma_dict(words, nlp)
         lemmas = toolz.itemfilter(self.is_new, lemmas)
         unchanged = pop_unchanged(lemmas)
         self.send(unchanged=unchanged, replacements=lemmas)
@@ -172,48 +159,12 @@ class ReplacementDialogNode(DialogNode):
             self.send(unchanged)
 
 
-def word_list_from_kindle(path):
-    """
-    Use :const:`MEANING2COLOR` `["words"]` to extract the list of words highlighted in this specific color.
-
-    Args:
-      path: Path to html-file exported by kindle.
-
-    Returns:
-      : List of highlighted words.
-    """
-    color = MEANING2COLOR["words"]
-    return dict_from_kindle_export(path)[color]
-
-
-def word_list_from_txt(path):
-    """
-    Return list of words read as lines from txt-file.
-
-    Args:
-      path: Path to txt-file. Each line should correspond to a word (or phrase).
-    """
-    with open(path) as file:
-        words = file.read().splitlines()
-    return words
-
-
-def word_list_from_kobo(path):
-    """Parse kobos .annot-file and return list of notations."""
-    with open(path) as file:
-        soup = BeautifulSoup(file, "lxml")
-    words = [tag.text for tag in soup.select("annotation text")]
-    return words
-
-
-@db_session
 def add_waiting(words, template=None):
-    """Add word in ``"waiting"`` state, waiting to be queued."""
-    template = template or MDApp.get_running_app().get_current_template_db()
-    for word in words:
-        if not template.get_card(word):
-            template.add_card(word)
-            MDApp.get_running_app().word_state_dict[word] = "waiting"
+    """Add words in ``"waiting"`` state, waiting to be queued. Words that already have a card are skipped."""
+    with db_session:
+        template = template or MDApp.get_running_app().get_current_template_db()
+        new_words = template.add_cards(words)
+    update_word_states(dict.fromkeys(new_words, "waiting"))
 
 
 replace_lemmas_nodes = [clean_words, "Lemmatizer", "ReplacementDialog", add_waiting]
@@ -1,25 +1,174 @@
-"""Language processing."""
+"""
+Language processing.
 
+The spacy pipelines are loaded by :const:`nlp_manager` in a background thread, such that neither the import of this
+module nor the start of the app wait for spacy. Functions that need a pipeline wait until it is loaded, code on the
+main thread registers a callback with :meth:`ModelManager.when_ready` instead.
+
+Phrases are lemmatized in batches with :meth:`spacy.language.Language.pipe` and the lemmas are stored in
+:const:`lemma_cache.lemma_cache`, such that every phrase is lemmatized only once per model.
+"""
 import re
 import string
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Callable, Dict, List
+
+import attr
+
+from .lemma_cache import lemma_cache
+from .utils import running_app
+
+MODELS = {
+    "de": "de_core_news_sm",
+    "en": "en_core_web_sm",
+    "es": "es_core_news_sm",
+    "fr": "fr_core_news_sm",
+    "it": "it_core_news_sm",
+    "pt": "pt_core_news_sm",
+}
+"""Name of the spacy model per language. Other languages are loaded by their code, e.g. a shortcut link."""
+
+
+@attr.s(auto_attribs=True)
+class ModelManager:
+    """Load spacy pipelines in a background thread and hold one instance per language."""
+
+    models: Dict[str, str] = attr.ib(factory=lambda: dict(MODELS))
+    """Name of the spacy model per language."""
+    disable: List[str] = attr.ib(factory=lambda: ["parser", "ner"])
+    """Components of the pipelines that are not needed for lemmatization and therefore not loaded."""
+    download: bool = True
+    """If ``True``, models that are not installed are downloaded."""
+    default_language: str = "pt"
+    """Language used if no app with a ``target_language`` is running. Set by ``acg batch`` from the config."""
+    batch_size: int = 256
+    """Number of phrases per batch of :meth:`spacy.language.Language.pipe`."""
+    n_process: int = 1
+    """Number of processes lemmatizing in parallel. Only used for more than :attr:`batch_size` phrases."""
+    multiprocessing: bool = False
+    """
+    If ``False``, :attr:`n_process` is ignored. Only ``acg batch`` enables it: the app runs the event loop of the
+    parsers and the loading of the pipelines in threads, and forking a multi-threaded process can deadlock.
+    """
+    retry_delay: float = 60
+    """Seconds after which :meth:`load` tries again to load a pipeline that failed to load."""
+    _futures: Dict[str, Future] = attr.ib(factory=dict)
+    _failed: Dict[str, float] = attr.ib(factory=dict)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock)
+    _executor: ThreadPoolExecutor = attr.ib(
+        factory=lambda: ThreadPoolExecutor(max_workers=1, thread_name_prefix="spacy")
+    )
+
+    def configure(self, section):
+        """
+        Set :attr:`batch_size` and :attr:`n_process` from ``section`` of the config.
+
+        Values that are not integers >= 1 are replaced by the default.
+
+        Returns:
+            : Dict ``{key: value}`` of the invalid values.
+        """
+        invalid = {}
+        for key in ["batch_size", "n_process"]:
+            if key in section:
+                try:
+                    value = int(section[key])
+                    if value < 1:
+                        raise ValueError(f"expected an integer >= 1, got {value}")
+                except ValueError as error:
+                    print(f"invalid value for {key}, using the default: {error}")
+                    invalid[key] = section[key]
+                    value = attr.fields_dict(self.__class__)[key].default
+                setattr(self, key, value)
+        return invalid
+
+    def to_dict(self):
+        """Return :attr:`batch_size` and :attr:`n_process` as dict of strings as used in the config."""
+        return {"batch_size": str(self.batch_size), "n_process": str(self.n_process)}
+
+    def load_model(self, language):
+        """Load and return the pipeline of ``language``. Blocks, use :meth:`load` instead."""
+        import spacy  # pylint: disable=import-outside-toplevel
+
+        name = self.models.get(language, language)
+        try:
+            return spacy.load(name, disable=self.disable)
+        except OSError:
+            if not self.download:
+                raise
+        spacy.cli.download(name)
+        return spacy.load(name, disable=self.disable)
 
-from kivymd.app import MDApp
+    def _load_or_none(self, language):
+        try:
+            return self.load_model(language)
+        # spacy.cli.download exits if the download fails, broken models raise all kinds of errors
+        except (Exception, SystemExit) as error:  # pylint: disable=broad-except
+            print(f"could not load spacy model for {language!r}: {error!r}")
+            with self._lock:
+                self._failed[language] = time.monotonic()
+            return None
 
+    def _should_retry(self, language):
+        """Return ``True`` if loading ``language`` failed more than :attr:`retry_delay` seconds ago. Not thread-safe."""
+        failed = self._failed.get(language)
+        return failed is not None and time.monotonic() - failed > self.retry_delay
 
-def get_nlp(language):
-    """Get NLP using spacy."""
-    import spacy  # pylint: disable=import-outside-toplevel
+    def load(self, language):
+        """
+        Start loading the pipeline of ``language`` in the background, unless already started.
 
-    if language not in spacy.info()["Models"]:
-        spacy.cli.download(language)
-    return spacy.load(language)
+        If loading failed, it is started again after :attr:`retry_delay` seconds.
 
+        Returns:
+            : :class:`~concurrent.futures.Future` of the pipeline. Its result is ``None`` if spacy or the model are
+            not available.
+        """
+        with self._lock:
+            if language not in self._futures or self._should_retry(language):
+                self._failed.pop(language, None)
+                self._futures[language] = self._executor.submit(
+                    self._load_or_none, language
+                )
+            return self._futures[language]
 
-try:
-    NLP = get_nlp("pt")
-except:  # pylint: disable=bare-except
-    NLP = None
-    print("COULD NOT FIND SPACY MODEL.")
+    def get(self, language=None, timeout=None):
+        """
+        Return the pipeline of ``language`` (default :meth:`target_language`), loading it if necessary.
+
+        Waits at most ``timeout`` seconds (default: until loaded). Returns ``None`` if the pipeline is not available
+        or not loaded in time.
+        """
+        try:
+            return self.load(language or self.target_language()).result(timeout)
+        except FutureTimeoutError:
+            return None
+
+    def is_ready(self, language=None):
+        """Return ``True`` if the pipeline of ``language`` finished loading (or failed to)."""
+        return self.load(language or self.target_language()).done()
+
+    def when_ready(self, callback: Callable, language=None):
+        """
+        Call ``callback(nlp)`` as soon as the pipeline of ``language`` is loaded.
+
+        If it is loaded already, ``callback`` is called immediately, else in the loading thread. Wrap ``callback``
+        with :func:`utils.mainthread` if it touches the ui.
+        """
+        self.load(language or self.target_language()).add_done_callback(
+            lambda future: callback(None if future.exception() else future.result())
+        )
+
+    def target_language(self):
+        """Return ``target_language`` of the running app or :attr:`default_language`."""
+        return getattr(running_app(), "target_language", None) or self.default_language
+
+
+nlp_manager = ModelManager()
+"""Process-wide instance."""
 
 
 def remove_punctuation(some_string):
@@ -32,15 +181,41 @@ def join_lemmas(doc):
     return "".join(token.lemma_ + token.whitespace_ for token in doc)
 
 
-def lemma_dict(phrases):
-    """Return dictionary with original_phrase: lemmatized_phrase."""
-    global NLP  # pylint: disable=global-statement
-    if not NLP:
+def model_version(nlp):
+    """Return string identifying the model of the pipeline ``nlp`` and its version."""
+    return f"{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+
+
+def pipe_lemmas(phrases, nlp):
+    """Return dictionary with original_phrase: lemmatized_phrase, lemmatized in batches by ``nlp``."""
+    n_process = (
+        nlp_manager.n_process
+        if nlp_manager.multiprocessing and len(phrases) > nlp_manager.batch_size
+        else 1
+    )
+    docs = nlp.pipe(phrases, batch_size=nlp_manager.batch_size, n_process=n_process)
+    return {phrase: join_lemmas(doc) for phrase, doc in zip(phrases, docs)}
+
+
+def lemma_dict(phrases, nlp=None):
+    """
+    Return dictionary with original_phrase: lemmatized_phrase.
+
+    Uses the pipeline ``nlp``, by default the one of the target language, waiting until it is loaded. Phrases are
+    returned unchanged if no pipeline is available. Lemmas are looked up in and saved to
+    :const:`lemma_cache.lemma_cache`, only the missing phrases are lemmatized.
+    """
+    nlp = nlp or nlp_manager.get()
+    if not nlp:
         return {phrase: phrase for phrase in phrases}
-    language = getattr(MDApp.get_running_app(), "target_language", None)
-    if language and NLP.lang != language:
-        NLP = get_nlp(language)
-    return {phrase: join_lemmas(NLP(phrase)) for phrase in phrases}
+    language, model = nlp.lang, model_version(nlp)
+    lemmas = lemma_cache.get_many(language, model, phrases)
+    missing = [phrase for phrase in dict.fromkeys(phrases) if phrase not in lemmas]
+    if missing:
+        new_lemmas = pipe_lemmas(missing, nlp)
+        lemma_cache.put_many(language, model, new_lemmas)
+        lemmas.update(new_lemmas)
+    return {phrase: lemmas[phrase] for phrase in phrases}
 
 
 def clean_up(words, remove_punct=True, lower_case=True, lemmatize=True):
@@ -61,7 +236,8 @@ def clean_up(words, remove_punct=True, lower_case=True, lemmatize=True):
     if lower_case:
         words = [word.lower() for word in words]
     if lemmatize:
-        words = list(lemma_dict(words).values())
+        lemmas = lemma_dict(words)
+        words = [lemmas[word] for word in words]
     return words
 
 
@@ -80,12 +256,13 @@ def tag_word_in_sentence(sentence, tag_word):
     words = clean_up(words, lemmatize=False)
     # get unique, non-empty strings:
     words = [word for word in set(words) if word]
-    lemmas = clean_up(words, lemmatize=True)
-    tag_lemma = clean_up([tag_word])[0]
+    clean_tag_word = clean_up([tag_word], lemmatize=False)[0]
+    # lemmatize all words of the sentence and the tag_word in one batch:
+    lemmas = lemma_dict(words + [clean_tag_word])
     words_found = [
         word
-        for word, lemma in zip(words, lemmas)
-        if lemma == tag_lemma or word == tag_word
+        for word in words
+        if lemmas[word] == lemmas[clean_tag_word] or word == tag_word
     ]
     for word in words_found:
         sentence = re.sub(
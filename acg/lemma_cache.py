@@ -0,0 +1,117 @@
+"""
+Persistent cache of the lemmas computed by :func:`language_processing.lemma_dict`.
+
+Lemmas are stored in a sqlite-file under :const:`acg.APP_DIR`, keyed by language, model and phrase. The model key
+contains the version of the spacy model, such that lemmas of an outdated model are not used after an update.
+Lemmas that were read or written once are also kept in memory, such that tagging many short sentences does not need a
+query per sentence.
+"""
+import pathlib
+import sqlite3
+import threading
+
+import attr
+
+from . import APP_DIR
+from .sqlite_profile import apply_pragmas
+
+MAX_VARIABLES = 500
+"""Maximal number of phrases per query, below the limit of sqlite for variables in a statement."""
+
+
+@attr.s(auto_attribs=True)
+class LemmaCache:
+    """Mapping ``phrase -> lemma`` per language and model, stored in a sqlite-file."""
+
+    path: pathlib.Path = APP_DIR / "lemmas.sqlite"
+    """Location of the sqlite-file."""
+    hits: int = 0
+    """Number of phrases answered from the cache."""
+    misses: int = 0
+    """Number of phrases that had to be lemmatized."""
+    max_memory: int = 2 ** 16
+    """Maximal number of lemmas kept in memory. The memory is emptied when it is full."""
+    _memory: dict = attr.ib(factory=dict)
+    _connection: sqlite3.Connection = None
+    _lock: threading.Lock = attr.ib(factory=threading.Lock)
+
+    @property
+    def connection(self):
+        """Open :attr:`path` and create table on first access."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            # losing the last lemmas on a crash is harmless, they are computed again
+            apply_pragmas(
+                self._connection, {"journal_mode": "WAL", "synchronous": "NORMAL"}
+            )
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lemmas (
+                    language TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    phrase TEXT NOT NULL,
+                    lemma TEXT NOT NULL,
+                    PRIMARY KEY (language, model, phrase)
+                ) WITHOUT ROWID
+                """
+            )
+        return self._connection
+
+    def get_many(self, language, model, phrases):
+        """Return dict ``{phrase: lemma}`` of those ``phrases`` that are cached."""
+        phrases = list(dict.fromkeys(phrases))
+        with self._lock:
+            memory = self._memory.get((language, model), {})
+            lemmas = {phrase: memory[phrase] for phrase in phrases if phrase in memory}
+            unknown = [phrase for phrase in phrases if phrase not in memory]
+            for start in range(0, len(unknown), MAX_VARIABLES):
+                chunk = unknown[start : start + MAX_VARIABLES]
+                lemmas.update(
+                    self.connection.execute(
+                        "SELECT phrase, lemma FROM lemmas WHERE language = ? AND model = ? "
+                        f"AND phrase IN ({', '.join('?' * len(chunk))})",
+                        (language, model, *chunk),
+                    )
+                )
+            self._remember(language, model, lemmas)
+            self.hits += len(lemmas)
+            self.misses += len(phrases) - len(lemmas)
+        return lemmas
+
+    def put_many(self, language, model, lemmas):
+        """Store dict ``lemmas`` of the form ``{phrase: lemma}``."""
+        with self._lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO lemmas VALUES (?, ?, ?, ?)",
+                [(language, model, phrase, lemma) for phrase, lemma in lemmas.items()],
+            )
+            self.connection.commit()
+            self._remember(language, model, lemmas)
+
+    def _remember(self, language, model, lemmas):
+        """Keep ``lemmas`` in memory. Not thread-safe."""
+        if sum(map(len, self._memory.values())) + len(lemmas) > self.max_memory:
+            self._memory.clear()
+        self._memory.setdefault((language, model), {}).update(lemmas)
+
+    def stats(self):
+        """Return dict with hit/miss counters and number of entries."""
+        with self._lock:
+            entries = self.connection.execute(
+                "SELECT COUNT(*) FROM lemmas"
+            ).fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self, model=None):
+        """Remove the lemmas of ``model`` or all lemmas."""
+        with self._lock:
+            self._memory.clear()
+            if model is None:
+                self.connection.execute("DELETE FROM lemmas")
+            else:
+                self.connection.execute("DELETE FROM lemmas WHERE model = ?", (model,))
+            self.connection.commit()
+
+
+lemma_cache = LemmaCache()
+"""Process-wide instance used by :func:`language_processing.lemma_dict`."""
@@ -21,7 +21,16 @@ from pony.orm import db_session
 
 from . import ANKI_DIR, ASSETS_DIR, CONFIG_PATH, HOME, db, screens
 from .custom_widgets.main_menu import MainMenu
+from .language_processing import nlp_manager
+from .parsers import (
+    DEFAULT_RATE_LIMITS,
+    rate_limiter,
+    request_policy,
+    session_manager,
+)
+from .sqlite_profile import default_pragmas
 from .templates import template_cookbook
+from .utils import BACKGROUND_LOOP, run_in_thread, toast
 
 os.environ["SSL_CERT_FILE"] = certifi.where()
 
@@ -55,6 +64,9 @@ class AnkiCardGenApp(MDApp):
     current_template_name = ConfigParserProperty(
         "Portuguese Vocabulary (en)", "Template", "name", "app"
     )
+    max_in_flight = ConfigParserProperty(
+        8, "Queue", "max_in_flight", "app", val_type=int
+    )
     # TODO: fix bug where default value has to be a valid recipe
     templates = AliasProperty(getter=lambda *_: template_cookbook.get_recipe_names())
 
@@ -86,6 +98,28 @@ class AnkiCardGenApp(MDApp):
             },
         )
         config.setdefaults("Paths", {})
+        config.setdefaults("RateLimits", DEFAULT_RATE_LIMITS)
+        config.setdefaults("Requests", request_policy.to_dict())
+        config.setdefaults("SQLite", default_pragmas())
+        config.setdefaults("Lemmatizer", nlp_manager.to_dict())
+
+    def apply_rate_limits(self, *_):
+        """Configure :const:`parsers.rate_limiter` from the section ``RateLimits`` of the config."""
+        invalid = rate_limiter.configure(self.config["RateLimits"])
+        if invalid:
+            toast(f"Invalid rate limits for {', '.join(invalid)}, using the defaults.")
+
+    def apply_request_policy(self, *_):
+        """Configure timeouts and retries of :const:`parsers.request_policy` from the section ``Requests``."""
+        invalid = request_policy.configure(self.config["Requests"])
+        if invalid:
+            toast(f"Invalid values for {', '.join(invalid)}, using the defaults.")
+
+    def apply_lemmatizer_settings(self, *_):
+        """Configure batch size and processes of :const:`language_processing.nlp_manager` from ``Lemmatizer``."""
+        invalid = nlp_manager.configure(self.config["Lemmatizer"])
+        if invalid:
+            toast(f"Invalid values for {', '.join(invalid)}, using the defaults.")
 
     def bind_theme_cls_and_config(self):
         """Bind :attr:`theme_cls` and the corresponding :class:`~kivy.properties.ConfigParserProperties`."""
@@ -117,25 +151,56 @@ class AnkiCardGenApp(MDApp):
     def get_word_states(self):
         """Return dict of word-states for current template from data-base."""
         with db_session:
-            return {
-                card.name: card.state for card in self.get_current_template_db().cards
-            }
+            return self.get_current_template_db().word_states()
 
-    def new_template_instance(self):
-        """Return new instance of current template class."""
-        return template_cookbook.cook(self.current_template_name)
+    def new_template_instance(self, **kwargs):
+        """Return new instance of current template class. ``kwargs`` are passed on, e.g. ``headless=True``."""
+        return template_cookbook.cook(self.current_template_name, **kwargs)
 
     def on_current_template_name(self, *_):
         """Set up new template if :attr:`current_template_name` changes."""
         self.template = self.new_template_instance()
         self.word_state_dict = self.get_word_states()
 
+    def on_target_language(self, *_):
+        """Start loading the spacy pipeline of :attr:`target_language` in the background."""
+        nlp_manager.load(self.target_language)
+
     def on_start(self):
         """Set up template on start of app."""
         super().on_start()
+        self.apply_rate_limits()
+        self.config.add_callback(self.apply_rate_limits, "RateLimits")
+        self.apply_request_policy()
+        self.config.add_callback(self.apply_request_policy, "Requests")
+        self.apply_lemmatizer_settings()
+        self.config.add_callback(self.apply_lemmatizer_settings, "Lemmatizer")
+        if db.invalid_pragmas:
+            toast(
+                f"Invalid SQLite settings for {', '.join(db.invalid_pragmas)}, using the defaults."
+            )
+        self.collect_media_garbage()
         self.on_current_template_name()
+        self.on_target_language()
         self.request_permissions()
 
+    @run_in_thread
+    def collect_media_garbage(self):
+        """Remove unused files from the media-store in a background thread, such that the start is not delayed."""
+        removed, freed = db.collect_media_garbage()
+        if removed:
+            self.on_media_garbage_collected(removed, freed)
+
+    @mainthread
+    def on_media_garbage_collected(self, removed, freed):  # pylint: disable=no-self-use
+        """Show the number of removed media-files and the freed space."""
+        toast(f"Removed {removed} unused media-files ({freed / 2 ** 20:.1f} MB).")
+
+    def on_stop(self):  # pylint: disable=no-self-use
+        """Close open connections and stop the background event loop."""
+        session_manager.shutdown()
+        BACKGROUND_LOOP.stop()
+
     def on_pause(self):  # pylint: disable=no-self-use
         """Enable coming back to app."""
         return True
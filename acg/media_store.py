@@ -0,0 +1,85 @@
+"""
+Content-addressed store for the media-files of the cards.
+
+Each file is saved once under :const:`acg.APP_DIR`/media, named by the sha256-hash of its content. The data-base only
+keeps hash, size and type in :class:`db.MediaFile`, such that identical files of different cards (e.g. the same
+audio-file) share one file on disk. Files that are no longer referenced by any :class:`db.MediaFile` are removed by
+:func:`db.collect_media_garbage`, unless they were stored recently: another process (e.g. ``acg batch``) may not have
+committed their :class:`db.MediaFile` yet.
+"""
+import hashlib
+import os
+import pathlib
+import shutil
+import tempfile
+import time
+
+import attr
+
+from . import APP_DIR
+
+
+@attr.s(auto_attribs=True)
+class MediaStore:
+    """Save and load files by the sha256-hash of their content."""
+
+    path: pathlib.Path = APP_DIR / "media"
+    """Root directory of the store. Files are sharded into sub-directories by the first two characters of the hash."""
+
+    def file_path(self, sha256):
+        """Return path of the file with hash ``sha256``."""
+        return self.path / sha256[:2] / sha256
+
+    def __contains__(self, sha256):
+        return self.file_path(sha256).exists()
+
+    def put(self, content):
+        """Save ``content`` (bytes) if it is not stored yet. Return tuple ``(sha256, size)``."""
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self.file_path(sha256)
+        try:
+            # refresh the age of existing files, such that the garbage collection keeps them
+            os.utime(path)
+        except FileNotFoundError:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+                file.write(content)
+            os.replace(file.name, path)
+        return sha256, len(content)
+
+    def get(self, sha256):
+        """Return content of the file with hash ``sha256``."""
+        return self.file_path(sha256).read_bytes()
+
+    def open(self, sha256):
+        """Open the file with hash ``sha256`` for binary reading."""
+        return open(self.file_path(sha256), "rb")
+
+    def copy(self, sha256, destination):
+        """Copy the file with hash ``sha256`` to ``destination``."""
+        shutil.copyfile(self.file_path(sha256), destination)
+
+    def remove(self, sha256):
+        """Remove the file with hash ``sha256`` if it exists. Return its size."""
+        path = self.file_path(sha256)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return 0
+        return size
+
+    def age(self, sha256):
+        """Return seconds since the file with hash ``sha256`` was last stored."""
+        return time.time() - self.file_path(sha256).stat().st_mtime
+
+    def hashes(self):
+        """Iterate over the hashes of all stored files."""
+        if self.path.exists():
+            for path in self.path.glob("??/*"):
+                if len(path.name) == 64:
+                    yield path.name
+
+
+media_store = MediaStore()
+"""Store used by :class:`db.MediaFile`."""
@@ -0,0 +1,166 @@
+"""
+Migrations of existing data-bases to the current schema of :mod:`db`.
+
+The schema version is kept in ``PRAGMA user_version``. :func:`migrate` is called by :mod:`db` before the mapping is
+generated and applies all migrations from :const:`MIGRATIONS` that are newer than the version of the file. Each
+migration gets a :class:`sqlite3.Connection` and has to cope with tables that do not exist yet: those are created by
+:mod:`pony` in the current schema.
+"""
+import sqlite3
+
+from .compression import compress
+from .media_store import media_store
+
+
+def table_exists(connection, table):
+    """Check if ``table`` exists."""
+    return bool(
+        connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone()
+    )
+
+
+def columns(connection, table):
+    """Return list of column names of ``table``."""
+    return [row[1] for row in connection.execute(f'PRAGMA table_info("{table}")')]
+
+
+def media_to_store(connection):
+    """Move the contents of ``MediaFile`` into :const:`media_store.media_store`, keeping only hash and size."""
+    if not table_exists(connection, "MediaFile") or "content" not in columns(
+        connection, "MediaFile"
+    ):
+        return False
+    connection.execute(
+        """
+        CREATE TABLE "MediaFile_new" (
+          "id" INTEGER PRIMARY KEY AUTOINCREMENT,
+          "type" TEXT NOT NULL,
+          "field_key" TEXT NOT NULL,
+          "sha256" TEXT NOT NULL,
+          "size" INTEGER NOT NULL,
+          "card" INTEGER NOT NULL REFERENCES "Card" ("id") ON DELETE CASCADE
+        )
+        """
+    )
+    rows = connection.execute(
+        'SELECT "id", "type", "field_key", "content", "card" FROM "MediaFile"'
+    )
+    for media_id, file_type, field_key, content, card in rows:
+        sha256, size = media_store.put(bytes(content))
+        connection.execute(
+            'INSERT INTO "MediaFile_new" VALUES (?, ?, ?, ?, ?, ?)',
+            (media_id, file_type, field_key, sha256, size, card),
+        )
+    for statement in [
+        'DROP TABLE "MediaFile"',
+        'ALTER TABLE "MediaFile_new" RENAME TO "MediaFile"',
+        'CREATE INDEX "idx_mediafile__card" ON "MediaFile" ("card")',
+        'CREATE INDEX "idx_mediafile__sha256" ON "MediaFile" ("sha256")',
+    ]:
+        connection.execute(statement)
+    return True
+
+
+def export_tracking(connection):
+    """Add the columns that remember what has been exported, see :func:`exporter.exporter.write_apkg`."""
+    changed = False
+    for table, column in [("Card", "exported_hash"), ("MediaFile", "exported_sha256")]:
+        if table_exists(connection, table) and column not in columns(connection, table):
+            connection.execute(
+                f'ALTER TABLE "{table}" ADD COLUMN "{column}" TEXT NOT NULL DEFAULT \'\''
+            )
+            changed = True
+    return changed
+
+
+def unique_card_names(connection):
+    """
+    Add unique index on ``("template", "name")`` of ``Card``.
+
+    Duplicates are removed first. As before, the card with the lowest id is kept.
+    """
+    if not table_exists(connection, "Card"):
+        return False
+    duplicates = connection.execute(
+        """
+        SELECT "id" FROM "Card" WHERE "id" NOT IN (
+          SELECT MIN("id") FROM "Card" GROUP BY "template", "name"
+        )
+        """
+    ).fetchall()
+    if table_exists(connection, "MediaFile"):
+        connection.executemany('DELETE FROM "MediaFile" WHERE "card" = ?', duplicates)
+    connection.executemany('DELETE FROM "Card" WHERE "id" = ?', duplicates)
+    connection.execute('DROP INDEX IF EXISTS "idx_card__template"')
+    connection.execute(
+        'CREATE UNIQUE INDEX "unq_card__template_name" ON "Card" ("template", "name")'
+    )
+    return True
+
+
+def compress_text(value):
+    """Return json-string ``value`` compressed. ``None`` and ``"null"`` become ``None``."""
+    return None if value in (None, "null") else compress(value.encode())
+
+
+def compress_card_data(connection):
+    """
+    Compress the json in ``base_data`` and ``fields`` of ``Card`` with :func:`compression.compress`.
+
+    The table is rebuilt, as the columns change from ``JSON NOT NULL`` to ``BLOB``, which is ``NULL`` for no data.
+    """
+    if not table_exists(connection, "Card"):
+        return False
+    connection.execute(
+        """
+        CREATE TABLE "Card_new" (
+          "id" INTEGER PRIMARY KEY AUTOINCREMENT,
+          "name" TEXT NOT NULL,
+          "state" TEXT NOT NULL,
+          "base_data" BLOB,
+          "fields" BLOB,
+          "dt_queried" DATETIME,
+          "dt_generated" DATETIME,
+          "dt_exported" DATETIME,
+          "exported_hash" TEXT NOT NULL,
+          "template" INTEGER NOT NULL REFERENCES "Template" ("id") ON DELETE CASCADE,
+          CONSTRAINT "unq_card__template_name" UNIQUE ("template", "name")
+        )
+        """
+    )
+    names = '"id", "name", "state", "base_data", "fields", "dt_queried", "dt_generated", "dt_exported", "exported_hash"'
+    rows = connection.execute(f'SELECT {names}, "template" FROM "Card"')
+    for row in rows:
+        connection.execute(
+            f'INSERT INTO "Card_new" VALUES ({", ".join("?" * len(row))})',
+            (*row[:3], compress_text(row[3]), compress_text(row[4]), *row[5:]),
+        )
+    connection.execute('DROP TABLE "Card"')
+    connection.execute('ALTER TABLE "Card_new" RENAME TO "Card"')
+    return True
+
+
+MIGRATIONS = [media_to_store, export_tracking, unique_card_names, compress_card_data]
+"""Migration number ``i`` migrates from version ``i`` to ``i + 1``. Append new migrations at the end."""
+
+
+def migrate(path):
+    """Apply pending :const:`MIGRATIONS` to the data-base at ``path``. Return names of applied migrations."""
+    connection = sqlite3.connect(str(path), isolation_level=None)
+    try:
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        applied = []
+        for number, migration in enumerate(MIGRATIONS[version:], start=version):
+            connection.execute("BEGIN")
+            if migration(connection):
+                applied.append(migration.__name__)
+            connection.execute(f"PRAGMA user_version = {number + 1}")
+            connection.execute("COMMIT")
+        if applied:
+            print(f"migrated data-base: {', '.join(applied)}")
+            connection.execute("VACUUM")
+        return applied
+    finally:
+        connection.close()
@@ -4,11 +4,20 @@ from .base import (
     AsyncLinguee,
     AsyncParser,
     AsyncReverso,
+    KnownNoMatchError,
     NoMatchError,
     Parser,
+    TransientError,
 )
+from .cache import response_cache
 from .google_image_parser import AsyncGoogleImages
+from .latency import parser_latency
+from .media import media_downloader
 from .new_parsers import EnglishParser
+from .rate_limit import DEFAULT_RATE_LIMITS, rate_limiter
+from .retry import request_policy
+from .session import session_manager
+from .single_flight import single_flight
 
 parser_cookbook = CookBook()
 
@@ -6,19 +6,26 @@ Each parser returns a dict, that can directly be used by the :meth:`pt_word.Word
 class.
 """
 import asyncio
+import html
 import re
+import time
 from collections import defaultdict
+from functools import partial
 from pprint import pprint
 from typing import Any, Dict
-from urllib.parse import quote
+from urllib.parse import quote, unquote
 
 import attr
-import pandas as pd
-import requests
-from aiohttp import ClientSession
-from bs4 import BeautifulSoup
+from lxml import etree
 
-from ..utils import async_get_results, remove_whitespace
+from ..utils import async_get_results, remove_whitespace, run_async
+from .cache import DAY, response_cache
+from .extract import has_class, html_tree, soup, stripped_strings
+from .latency import parser_latency
+from .rate_limit import rate_limiter, retry_after_seconds
+from .retry import RETRY_STATUSES, request_policy
+from .session import session_manager
+from .single_flight import single_flight
 
 LANGUAGES = {"pt": "portuguese", "de": "german", "en": "english", "es": "spanish"}
 
@@ -52,6 +59,46 @@ LINGUEE_HEADERS = {
 }
 
 
+CONJ_PRONOUNS = ["eu", "ele", "nós", "eles"]
+"""Rows of the conjugation tables of :class:`AsyncDicio`."""
+
+
+def html_cell(value):
+    """Format ``value`` for an html-table like :meth:`pandas.DataFrame.to_html` does."""
+    value = str(value).replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+    return html.escape(value, quote=False).strip()
+
+
+def html_table(header, cells, classes):
+    """Return single-column html-table like ``DataFrame.to_html(columns=[header], classes=classes, index=False)``."""
+    rows = "".join(
+        f"    <tr>\n      <td>{html_cell(cell)}</td>\n    </tr>\n" for cell in cells
+    )
+    return (
+        f'<table border="1" class="dataframe {classes}">\n'
+        "  <thead>\n"
+        '    <tr style="text-align: right;">\n'
+        f"      <th>{html_cell(header)}</th>\n"
+        "    </tr>\n"
+        "  </thead>\n"
+        "  <tbody>\n"
+        f"{rows}"
+        "  </tbody>\n"
+        "</table>"
+    )
+
+
+def cached_response(url, content):
+    """Construct :class:`requests.Response` with status 200 from cached ``content``."""
+    import requests  # pylint: disable=import-outside-toplevel
+
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = content  # pylint: disable=protected-access
+    return response
+
+
 class NoMatchError(Exception):
     """Error if no match can be found for the current search."""
 
@@ -60,6 +107,18 @@ class NoMatchError(Exception):
         self.site = site
 
 
+class KnownNoMatchError(NoMatchError):
+    """Error if the lookup is skipped, because it is known from :const:`parsers.cache.response_cache` to fail."""
+
+
+class TransientError(Exception):
+    """Error if the request failed for a reason that might vanish on retry, e.g. a timeout or a 502 response."""
+
+    def __init__(self, site=""):
+        super().__init__()
+        self.site = site
+
+
 @attr.s(auto_attribs=True)
 class Parser:
     """Base class for parsers.
@@ -80,6 +139,8 @@ class Parser:
     """
     headers: dict = DEFAULT_HEADERS
     """Headers for the request. Defaults to :const:`DEFAULT_HEADERS`."""
+    cache_ttl = 7 * DAY
+    """Seconds a response is kept in :const:`parsers.cache.response_cache`. ``0`` disables caching."""
 
     def setup(self):
         """Stuff that needs to be executed before :meth:`format_url_with_attribs` is called."""
@@ -106,9 +167,19 @@ class Parser:
 
         """
         url = self.format_url_with_attribs(url)
-        return requests.get(url, headers=self.headers)
+        name = self.__class__.__name__
+        key = response_cache.key(name, url, None, self.from_lang, self.to_lang)
+        content = response_cache.get(key, self.cache_ttl)
+        if content is not None:
+            return cached_response(url, content)
+        import requests  # pylint: disable=import-outside-toplevel
+
+        response = requests.get(url, headers=self.headers)
+        if response.status_code == 200 and self.cache_ttl:
+            response_cache.put(key, name, response.content)
+        return response
 
-    def parse_response(self, response: requests.Response) -> Dict[str, Any]:
+    def parse_response(self, response) -> Dict[str, Any]:
         """Parse :class:`requests.response` and return dict with result."""
 
     def result_dict(self, phrase=None):
@@ -121,55 +192,6 @@ class Parser:
         return self.parse_response(resp)
 
 
-@attr.s(auto_attribs=True)
-class RandTopicWikiParser(Parser):
-    """Get title, summary and a list of image-urls for given random topic."""
-
-    base_url = "https://en.wikipedia.org/api/rest_v1/page/summary/{page}"
-    media_url = (
-        "https://en.wikipedia.org/api/rest_v1/page/media-list/{title}?redirect=true"
-    )
-    page = ""
-    title = ""
-
-    def make_request(  # pylint: disable=arguments-differ
-        self, url=None, tries=10, category=None
-    ):
-        """
-        Call base method if url is set. Else obtain response from random wiki page.
-
-        Because we only use content-pages and not category-pages ``try`` specifies how often we draw a random page.
-        """
-        if url:
-            return super().make_request(url=url)
-        category = category or self.phrase
-        for _ in range(tries):
-            self.page = get_random_wiki_topic(category)
-            resp = super().make_request()
-            if resp.status_code == 200:
-                return resp
-            print(resp.status_code, resp.content)
-            # TODO: Error handling.
-        raise NoMatchError(site="Wiki")
-
-    def parse_response(self, response: requests.Response) -> Dict[str, Any]:
-        """Extract title, summary, image_urls and return in dict."""
-        json_resp = response.json()
-        title = json_resp["title"]
-        summary = json_resp["extract"]
-        self.title = json_resp["titles"]["canonical"]
-        media_json_resp = self.make_request(url=self.media_url).json()
-        if media_json_resp["items"]:
-            image = [
-                "https:" + item["srcset"][0]["src"]
-                for item in media_json_resp["items"]
-                if item["type"] == "image"
-            ]
-        else:
-            image = []
-        return {"title": title, "summary": summary, "image": image}
-
-
 @attr.s(auto_attribs=True)
 class AsyncParser:
     """Base-Class for asynchronous parsers."""
@@ -180,6 +202,13 @@ class AsyncParser:
     headers: dict = DEFAULT_HEADERS
     from_lang: str = None
     to_lang: str = None
+    parse_backend: str = "lxml"
+    """Selects the method used by :meth:`parse_response`: ``"lxml"`` or ``"bs4"``."""
+    cache_ttl = 30 * DAY
+    """Seconds a response is kept in :const:`parsers.cache.response_cache`. ``0`` disables caching."""
+    no_match_ttl = 3 * DAY
+    """Seconds a :class:`NoMatchError` for a phrase is remembered. During that time, the parser raises it without
+    making any request. ``0`` disables the negative cache."""
 
     @staticmethod
     def format_str(some_str):
@@ -201,42 +230,152 @@ class AsyncParser:
         """Return request-params."""
         return {}
 
+    def cache_key(self, url, params):
+        """Return key of the request in :const:`parsers.cache.response_cache`."""
+        return response_cache.key(
+            self.__class__.__name__, url, params, self.from_lang, self.to_lang
+        )
+
+    def no_match_key(self, phrase):
+        """Return key of the failed lookups of ``phrase`` by this parser with the same languages."""
+        return response_cache.no_match_key(
+            self.__class__.__name__, phrase, self.from_lang, self.to_lang
+        )
+
     async def request(self, url=None, request_params=None):
-        """Make http-request using :package:`aiohttp`."""
+        """
+        Make http-request using the shared session of :const:`parsers.session.session_manager`.
+
+        Responses are looked up in and saved to :const:`parsers.cache.response_cache`. Requests to the network are
+        throttled by :const:`parsers.rate_limit.rate_limiter`. Timeouts and responses with a status in
+        :const:`parsers.retry.RETRY_STATUSES` are retried as specified by :const:`parsers.retry.request_policy`.
+
+        Raises:
+            NoMatchError: If the response has any other status than 200.
+            TransientError: If all retries failed.
+        """
+        from aiohttp import ClientError  # pylint: disable=import-outside-toplevel
+
         url = url or self.url
         url = url() if callable(url) else url
-        params = request_params or self.request_params()
-        async with ClientSession() as session:
-            async with session.get(
-                url, params=params, headers=self.headers
-            ) as response:
-                if response.status != 200:
+        params = self.request_params() if request_params is None else request_params
+        key = self.cache_key(url, params)
+        result = response_cache.get(key, self.cache_ttl)
+        if result is not None:
+            return result
+        attempt = 0
+        while True:
+            try:
+                status, result, retry_after = await self._fetch(url, params)
+            except (ClientError, asyncio.TimeoutError) as error:
+                status, retry_after = repr(error), None
+            else:
+                if status == 200:
+                    break
+                if status not in RETRY_STATUSES:
                     raise NoMatchError(
                         f"Parser: {self.__class__}, phrase: {self.phrase}"
                     )
+            if attempt >= request_policy.retries:
+                raise TransientError(
+                    f"Parser: {self.__class__}, phrase: {self.phrase}, last error: {status}"
+                )
+            await asyncio.sleep(request_policy.delay(attempt, retry_after))
+            attempt += 1
+        if result is not None and self.cache_ttl:
+            response_cache.put(key, self.__class__.__name__, result)
+        return result
+
+    async def _fetch(self, url, params):
+        """Make a single request. Return status, content (if status is 200) and ``Retry-After`` in seconds."""
+        session = session_manager.get_session()
+        await rate_limiter.acquire(url)
+        async with session.get(
+            url, params=params, headers=self.headers, timeout=request_policy.timeout()
+        ) as response:
+            retry_after = response.headers.get("Retry-After")
+            rate_limiter.feedback(url, response.status, retry_after)
+            result = None
+            if response.status == 200:
                 if "html" in response.content_type:
-                    return await response.text()
-                if "json" in response.content_type:
-                    return await response.json()
-
-    def parse_response(  # pylint: disable=no-self-use,unused-argument
-        self, response: dict or list or str
-    ) -> Dict[str, list]:
-        """Placeholder-function."""
-        return {}
+                    result = await response.text()
+                elif "json" in response.content_type:
+                    result = await response.json()
+            return response.status, result, retry_after_seconds(retry_after)
+
+    async def resolve_response(self, response):  # pylint: disable=no-self-use
+        """
+        Placeholder-function. Called with the result of :meth:`request` before it is passed to :meth:`parse_response`.
 
-    async def __call__(self, phrase):
-        """Return results asynchronously."""
-        self.phrase = phrase
-        print(f"started {self.__class__.__name__}")
-        response = await self.request()
-        response = self.parse_response(response)
-        print(f"finished {self.__class__.__name__}")
+        Overwrite to make follow-up requests with :meth:`request`, e.g. if the first response only contains a link
+        to the actual content.
+        """
+        return response
+
+    def parse_response(self, response: dict or list or str) -> Dict[str, list]:
+        """
+        Call ``parse_<parse_backend>``, e.g. :meth:`parse_lxml`, on the response if implemented.
+
+        Otherwise return empty dict.
+        """
+        parse = getattr(self, f"parse_{self.parse_backend}", None)
+        return parse(response) if parse else {}
+
+    def flight_key(self, phrase):
+        """
+        Return key under which calls are coalesced by :const:`parsers.single_flight.single_flight`.
+
+        Return ``None`` to disable coalescing.
+        """
+        return (
+            self.__class__.__name__,
+            phrase,
+            self.from_lang,
+            self.to_lang,
+            self.parse_backend,
+        )
+
+    async def __call__(self, phrase, use_no_match_cache=True):
+        """
+        Return results asynchronously.
+
+        The request is made by a copy of the parser with :attr:`phrase` set, so a single instance can be used for
+        multiple phrases concurrently. Concurrent calls with the same :meth:`flight_key` share one lookup.
+
+        Raises:
+            KnownNoMatchError: If ``use_no_match_cache`` and the lookup failed less than :attr:`no_match_ttl` ago.
+        """
+        flight_key = self.flight_key(phrase)
+        if flight_key is not None:
+            flight_key = (*flight_key, use_no_match_cache)
+        return await single_flight.do(
+            flight_key, partial(self._call, phrase, use_no_match_cache)
+        )
+
+    async def _call(self, phrase, use_no_match_cache=True):
+        name = self.__class__.__name__
+        key = self.no_match_key(phrase)
+        if use_no_match_cache and response_cache.has_no_match(key, self.no_match_ttl):
+            raise KnownNoMatchError(site=name)
+        parser = attr.evolve(self, phrase=phrase)
+        print(f"started {name}")
+        start = time.perf_counter()
+        try:
+            response = await parser.request()
+            response = await parser.resolve_response(response)
+            response = parser.parse_response(response)
+        except NoMatchError:
+            if self.no_match_ttl:
+                response_cache.put_no_match(key, name, phrase)
+            raise
+        finally:
+            parser_latency.record(name, time.perf_counter() - start)
+        print(f"finished {name}")
         return response
 
     def result_dict(self, phrase):
         """Return results synchronously."""
-        return asyncio.run(self(phrase))
+        return run_async(self(phrase))
 
 
 @attr.s(auto_attribs=True)
@@ -254,9 +393,21 @@ class AsyncReverso(AsyncParser):
         )
         return super().url(url=url)
 
-    def parse_response(self, response: dict or list or str) -> Dict[str, list]:
-        """Parse response and return dict of the form ``{"examples":[ [ex_src_lang, ex_trg_lang],...]]}``."""
-        bs = BeautifulSoup(response, features="lxml")
+    _examples = etree.XPath(f"//div[{has_class('example')}]")
+    _src = etree.XPath(f".//div[{has_class('src')}]")
+    _trg = etree.XPath(f".//div[{has_class('trg')}]")
+
+    def parse_lxml(self, response):
+        """Parse response and return dict of the form ``{"example": [...], "example_trans": [...]}``."""
+        examples = self._examples(html_tree(response))
+        return {
+            "example": [self._src(x)[0].text_content().strip() for x in examples],
+            "example_trans": [self._trg(x)[0].text_content().strip() for x in examples],
+        }
+
+    def parse_bs4(self, response):  # pylint: disable=no-self-use
+        """Parse response and return dict of the form ``{"example": [...], "example_trans": [...]}``."""
+        bs = soup(response)
         examples = bs.select("div.example")
         return {
             "example": [x.select_one("div.src").text.strip() for x in examples],
@@ -319,6 +470,59 @@ class AsyncLinguee(AsyncParser):
         }
 
 
+@attr.s(auto_attribs=True)
+class RandTopicWikiParser(AsyncParser):
+    """Get title, summary and a list of image-urls for a random page in the category given as phrase."""
+
+    base_url: str = "https://en.wikipedia.org/api/rest_v1/page/summary/{page}"
+    media_url = (
+        "https://en.wikipedia.org/api/rest_v1/page/media-list/{title}?redirect=true"
+    )
+    page: str = ""
+    title: str = ""
+    tries: int = 10
+    """Because we only use content-pages and not category-pages, ``tries`` specifies how often we draw a random
+    page."""
+    no_match_ttl = 0
+
+    def flight_key(self, phrase):  # pylint: disable=no-self-use,unused-argument
+        """Do not coalesce calls, as each one should return a different random page."""
+        return None
+
+    async def request(self, url=None, request_params=None):
+        """Call base method if url is set. Else obtain response from random wiki page."""
+        if url:
+            return await super().request(url=url, request_params=request_params)
+        for _ in range(self.tries):
+            self.page = await get_random_wiki_topic(self.phrase)
+            try:
+                return await super().request()
+            except NoMatchError:
+                continue
+        raise NoMatchError(site="Wiki")
+
+    async def resolve_response(self, response):
+        """Request the media-list of the page. Return tuple of summary- and media-list-response."""
+        self.title = response["titles"]["canonical"]
+        media_response = await self.request(url=self.url(self.media_url))
+        return response, media_response
+
+    def parse_response(self, response):
+        """Extract title, summary, image_urls and return in dict."""
+        json_resp, media_json_resp = response
+        title = json_resp["title"]
+        summary = json_resp["extract"]
+        if media_json_resp["items"]:
+            image = [
+                "https:" + item["srcset"][0]["src"]
+                for item in media_json_resp["items"]
+                if item["type"] == "image"
+            ]
+        else:
+            image = []
+        return {"title": title, "summary": summary, "image": image}
+
+
 @attr.s(auto_attribs=True)
 class AsyncDicio(AsyncParser):
     """Uses Dicio to obtain: explanations, synonyms, antonyms, examples, add_info_dict, conj_table_html."""
@@ -329,35 +533,90 @@ class AsyncDicio(AsyncParser):
         """Return request params."""
         return {"q": self.phrase}
 
-    def parse_response(self, response: dict or list or str) -> Dict[str, list]:
-        """Extract: explanations, synonyms, antonyms, examples, add_info_dict, conj_table_html."""
-        bs = BeautifulSoup(response, "lxml")
-        suggestion = bs.select("a._sugg")
+    def cache_key(self, url, params):
+        """Ignore :attr:`to_lang`, such that the cached response is shared between templates."""
+        return response_cache.key(self.__class__.__name__, url, params, self.from_lang)
+
+    _suggestion = etree.XPath(f"//a[{has_class('_sugg')}]/@href")
+    _explanations = etree.XPath(
+        f"//*[{has_class('significado')}]/span[not({has_class('cl')})]"
+    )
+    _examples = etree.XPath(
+        f"//*[{has_class('tit-frases')}]/following-sibling::*[1][{has_class('frases')}]"
+        f"//div[{has_class('frase')}]"
+    )
+    _synonyms = etree.XPath(
+        f"//p[{has_class('sinonimos')}][text()[contains(., 'sin')]]//a"
+    )
+    _antonyms = etree.XPath(
+        f"//p[{has_class('sinonimos')}][text()[contains(., 'contr')]]//a"
+    )
+    _additional_info = etree.XPath(
+        f"//h2[{has_class('tit-section')}]/following-sibling::*[1][self::p][{has_class('adicional')}]"
+    )
+    _modos = etree.XPath(f"//div[{has_class('modo')}]")
+    # <a...>-tags are removed from the bs4-version of the conjugation table. Because of the regex used there, this
+    # includes all tags starting with "a", e.g. <abbr>.
+    _after_modo = etree.XPath(
+        "(descendant::* | following::*)[not(starts-with(name(), 'a'))][1]"
+    )
+    _list_items = etree.XPath(".//li")
+
+    def _suggestion_links(self, response):
+        if self.parse_backend == "bs4":
+            return [a["href"] for a in soup(response).select("a._sugg")]
+        return self._suggestion(html_tree(response))
+
+    async def resolve_response(self, response):
+        """If Dicio suggests a different spelling, request the page of the suggestion instead."""
+        suggestion = self._suggestion_links(response)
         if suggestion:
-            response = requests.get(
-                url=f'https://www.dicio.com.br{suggestion[0]["href"]}'
+            return await self.request(
+                url=f"https://www.dicio.com.br{suggestion[0]}",
+                request_params={},
             )
-            bs = BeautifulSoup(response.content, "lxml")
-        explanations = [e.text for e in bs.select(".significado > span:not(.cl)")]
-        examples = [
-            phrase.text.strip()
-            for phrase in bs.select(".tit-frases + .frases div.frase")
-        ]
-        synonyms = [
-            element.text
-            for element in bs.select('p.sinonimos:-soup-contains-own("sin") a')
-        ]
-        antonyms = [
-            element.text
-            for element in bs.select('p.sinonimos:-soup-contains-own("contr") a')
-        ]
-        add_info_dict = remove_whitespace(
-            bs.select("h2.tit-section + p.adicional")[0].text
+        return response
+
+    def parse_lxml(self, response):
+        """Extract: explanations, synonyms, antonyms, examples, add_info_dict, conj_table_html."""
+        tree = html_tree(response)
+        return self._result_dict(
+            explanations=[e.text_content() for e in self._explanations(tree)],
+            examples=[e.text_content().strip() for e in self._examples(tree)],
+            synonyms=[e.text_content() for e in self._synonyms(tree)],
+            antonyms=[e.text_content() for e in self._antonyms(tree)],
+            additional_info=self._additional_info(tree)[0].text_content(),
+            conj_dict_fn=partial(self._conj_dict_lxml, tree),
         )
+
+    def parse_bs4(self, response):
+        """Extract: explanations, synonyms, antonyms, examples, add_info_dict, conj_table_html."""
+        bs = soup(response)
+        return self._result_dict(
+            explanations=[e.text for e in bs.select(".significado > span:not(.cl)")],
+            examples=[
+                phrase.text.strip()
+                for phrase in bs.select(".tit-frases + .frases div.frase")
+            ],
+            synonyms=[
+                element.text
+                for element in bs.select('p.sinonimos:-soup-contains-own("sin") a')
+            ],
+            antonyms=[
+                element.text
+                for element in bs.select('p.sinonimos:-soup-contains-own("contr") a')
+            ],
+            additional_info=bs.select("h2.tit-section + p.adicional")[0].text,
+            conj_dict_fn=partial(self._conj_dict_bs4, bs),
+        )
+
+    def _result_dict(  # pylint: disable=too-many-arguments
+        self, explanations, examples, synonyms, antonyms, additional_info, conj_dict_fn
+    ):
         conj_table_html = ""
         try:
-            conj_table_df = self._conj_df(bs)
-            conj_table_html = self._html_from_conj_df(conj_table_df)
+            conj_table = self._conj_table(conj_dict_fn())
+            conj_table_html = self._html_from_conj_table(conj_table)
         except KeyError:
             print("no conjugation table obtained :(")
         return {
@@ -369,23 +628,15 @@ class AsyncDicio(AsyncParser):
             "antonym_trans": [None for _ in antonyms],
             "example": examples,
             "example_trans": [None for _ in examples],
-            "additional_info": add_info_dict,
+            "additional_info": remove_whitespace(additional_info),
             "conjugation_table": conj_table_html,
         }
 
     @staticmethod
-    def _conj_df(bs_obj):
-        html_string = re.sub(r"(<a[^>]*>)", "", bs_obj.prettify())
-        bs = BeautifulSoup(html_string, "lxml")
+    def _conj_dict_from_columns(columns):
+        """Return dict ``{tempo: {pronoun: verb}}`` from lists of strings, where the first entry is the tempo."""
         conjugation_table_dict = defaultdict(dict)
-        # the following [:2] only takes indicativo and subjuntivo
-        temp_cols = [
-            temp_col
-            for modo_table in bs.select("div.modo")[:2]
-            for temp_col in modo_table.find_next().select("li")
-        ]
-        for tempo_col in temp_cols:
-            strings = list(tempo_col.stripped_strings)
+        for strings in columns:
             tempo = strings[0]
             verb_col = [
                 [word.strip() for word in row.split(" ") if word.strip() != ""]
@@ -393,22 +644,53 @@ class AsyncDicio(AsyncParser):
             ]
             for row in verb_col:
                 conjugation_table_dict[tempo][row[0]] = row[1]
-        return pd.DataFrame.from_dict(conjugation_table_dict).loc[
-            ["eu", "ele", "nós", "eles"]
-        ]
+        return conjugation_table_dict
+
+    def _conj_dict_lxml(self, tree):
+        # the following [:2] only takes indicativo and subjuntivo
+        return self._conj_dict_from_columns(
+            stripped_strings(tempo_col, transparent=lambda tag: tag.startswith("a"))
+            for modo_table in self._modos(tree)[:2]
+            for tempo_col in self._list_items(self._after_modo(modo_table)[0])
+        )
+
+    def _conj_dict_bs4(self, bs_obj):
+        html_string = re.sub(r"(<a[^>]*>)", "", bs_obj.prettify())
+        bs = soup(html_string)
+        # the following [:2] only takes indicativo and subjuntivo
+        return self._conj_dict_from_columns(
+            list(tempo_col.stripped_strings)
+            for modo_table in bs.select("div.modo")[:2]
+            for tempo_col in modo_table.find_next().select("li")
+        )
 
     @staticmethod
-    def _html_from_conj_df(conj_table_df):
+    def _conj_table(conjugation_table_dict):
+        """
+        Return dict ``{tempo: [verb for pronoun in CONJ_PRONOUNS]}``.
+
+        Raises:
+            KeyError: If a pronoun is missing in all tempos. Missing in a single tempo gives ``"NaN"``.
+        """
+        pronouns = {
+            pronoun for col in conjugation_table_dict.values() for pronoun in col
+        }
+        missing = [pronoun for pronoun in CONJ_PRONOUNS if pronoun not in pronouns]
+        if missing:
+            raise KeyError(missing)
+        return {
+            tempo: [col.get(pronoun, "NaN") for pronoun in CONJ_PRONOUNS]
+            for tempo, col in conjugation_table_dict.items()
+        }
+
+    @staticmethod
+    def _html_from_conj_table(conj_table):
         return "\n".join(
             [
-                conj_table_df.to_html(
-                    columns=[col],
-                    classes="subj" if "Subjuntivo" in col else "ind",
-                    index=False,
-                )
+                html_table(col, verbs, classes="subj" if "Subjuntivo" in col else "ind")
                 .replace("do Subjuntivo", "")
                 .replace("do Indicativo", "")
-                for col in conj_table_df
+                for col, verbs in conj_table.items()
             ]
         )
 
@@ -416,22 +698,25 @@ class AsyncDicio(AsyncParser):
 def linguee_did_you_mean(search_term):
     """Extract suggested corrections if the original search is not successful."""
     # TODO: generalize to different languages
+    import requests  # pylint: disable=import-outside-toplevel
+
     response = requests.get(
         f"https://www.linguee.de/deutsch-portugiesisch/search?source=portugiesisch&query={search_term}",
         headers=LINGUEE_HEADERS,
     )
-    bs = BeautifulSoup(response.content, "lxml")
+    bs = soup(response.content)
     return [element.text for element in bs.select("span.corrected")]
 
 
-def get_random_wiki_topic(category):
+async def get_random_wiki_topic(category):
     """Return page-string for a random page in a category."""
     print(category)
-    resp = requests.get(
-        f"https://en.wikipedia.org/wiki/Special:RandomInCategory/{category}",
-        allow_redirects=False,
-    )
-    page_string = resp.headers["Location"].split("/wiki/")[-1]
+    url = f"https://en.wikipedia.org/wiki/Special:RandomInCategory/{category}"
+    await rate_limiter.acquire(url)
+    async with session_manager.get_session().get(
+        url, allow_redirects=False, timeout=request_policy.timeout()
+    ) as resp:
+        page_string = unquote(resp.headers["Location"].split("/wiki/")[-1])
     page_string = re.sub("Category:", "", page_string)
     return page_string
 
@@ -0,0 +1,212 @@
+"""
+Persistent cache for the raw responses obtained by the parsers.
+
+Responses are stored in a sqlite-file under :const:`acg.APP_DIR`, keyed by parser class, url, request-params and
+languages. Each parser defines its own time-to-live via ``cache_ttl``. If the total size of the stored responses
+exceeds :attr:`ResponseCache.max_bytes`, the least recently used entries are evicted.
+
+Lookups that failed with :class:`parsers.NoMatchError` are stored in a separate table with their own time-to-live
+(``no_match_ttl`` of the parser), such that known-dead parsers are skipped when a word is searched again.
+"""
+import hashlib
+import json
+import pathlib
+import sqlite3
+import threading
+import time
+
+import attr
+
+from .. import APP_DIR
+
+DAY = 24 * 60 * 60
+"""Seconds per day."""
+
+
+@attr.s(auto_attribs=True)
+class ResponseCache:
+    """Size-bounded LRU-cache with time-to-live, stored in a sqlite-file."""
+
+    path: pathlib.Path = APP_DIR / "http_cache.sqlite"
+    """Location of the sqlite-file."""
+    max_bytes: int = 256 * 2 ** 20
+    """Maximal total size of all stored responses."""
+    hits: int = 0
+    """Number of requests answered from the cache."""
+    misses: int = 0
+    """Number of requests that had to go to the network."""
+    bytes_saved: int = 0
+    """Total size of the responses answered from the cache."""
+    no_match_hits: int = 0
+    """Number of lookups skipped because they are known to fail."""
+    _connection: sqlite3.Connection = None
+    _lock: threading.Lock = attr.ib(factory=threading.Lock)
+
+    @property
+    def connection(self):
+        """Open :attr:`path` and create table on first access."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._connection.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    parser TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_responses__accessed ON responses (accessed);
+                CREATE TABLE IF NOT EXISTS no_matches (
+                    key TEXT PRIMARY KEY,
+                    parser TEXT NOT NULL,
+                    phrase TEXT,
+                    created REAL NOT NULL
+                );
+                """
+            )
+        return self._connection
+
+    @staticmethod
+    def key(parser, url, params=None, from_lang=None, to_lang=None):
+        """Return hash identifying a single request."""
+        key_string = json.dumps(
+            [parser, url, params or {}, from_lang, to_lang], sort_keys=True
+        )
+        return hashlib.sha256(key_string.encode()).hexdigest()
+
+    @staticmethod
+    def no_match_key(parser, phrase, from_lang=None, to_lang=None):
+        """Return hash identifying the failed lookups of ``phrase`` by ``parser``."""
+        key_string = json.dumps(["no_match", parser, phrase, from_lang, to_lang])
+        return hashlib.sha256(key_string.encode()).hexdigest()
+
+    @staticmethod
+    def _dump(value):
+        if isinstance(value, bytes):
+            return "bytes", value
+        if isinstance(value, str):
+            return "text", value.encode()
+        return "json", json.dumps(value).encode()
+
+    @staticmethod
+    def _load(kind, body):
+        if kind == "bytes":
+            return bytes(body)
+        if kind == "text":
+            return bytes(body).decode()
+        return json.loads(body)
+
+    def get(self, key, ttl):
+        """Return cached value for ``key`` if it is younger than ``ttl`` seconds, else ``None``."""
+        if not ttl:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT kind, body, size, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[3] > ttl:
+                self.misses += 1
+                return None
+            self.connection.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+            )
+            self.connection.commit()
+            self.hits += 1
+            self.bytes_saved += row[2]
+        return self._load(row[0], row[1])
+
+    def put(self, key, parser, value):
+        """Store ``value`` (str, bytes or json-serializable object) and evict old entries if necessary."""
+        kind, body = self._dump(value)
+        now = time.time()
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, parser, kind, body, len(body), now, now),
+            )
+            self._evict()
+            self.connection.commit()
+
+    def has_no_match(self, key, ttl):
+        """Return whether the lookup ``key`` failed less than ``ttl`` seconds ago."""
+        if not ttl:
+            return False
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT created FROM no_matches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or time.time() - row[0] > ttl:
+                return False
+            self.no_match_hits += 1
+        return True
+
+    def put_no_match(self, key, parser, phrase):
+        """Remember that the lookup ``key`` of ``phrase`` by ``parser`` failed."""
+        with self._lock:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO no_matches VALUES (?, ?, ?, ?)",
+                (key, parser, phrase, time.time()),
+            )
+            self.connection.commit()
+
+    def _evict(self):
+        total = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self.connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed"
+        ):
+            if total <= self.max_bytes:
+                break
+            total -= size
+            evicted.append((key,))
+        self.connection.executemany("DELETE FROM responses WHERE key = ?", evicted)
+
+    def stats(self):
+        """Return dict with hit/miss counters, number of entries and total size."""
+        with self._lock:
+            entries, size = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            no_matches = self.connection.execute(
+                "SELECT COUNT(*) FROM no_matches"
+            ).fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "entries": entries,
+            "bytes": size,
+            "no_match_hits": self.no_match_hits,
+            "no_matches": no_matches,
+        }
+
+    def clear(self):
+        """Remove all entries, including the failed lookups."""
+        with self._lock:
+            self.connection.execute("DELETE FROM responses")
+            self.connection.execute("DELETE FROM no_matches")
+            self.connection.commit()
+
+    def clear_no_matches(self, parser=None):
+        """Forget failed lookups of ``parser`` (class name) or of all parsers. Return number of removed lookups."""
+        with self._lock:
+            if parser is None:
+                cursor = self.connection.execute("DELETE FROM no_matches")
+            else:
+                cursor = self.connection.execute(
+                    "DELETE FROM no_matches WHERE parser = ?", (parser,)
+                )
+            self.connection.commit()
+        return cursor.rowcount
+
+
+response_cache = ResponseCache()
+"""Process-wide instance used by all parsers."""
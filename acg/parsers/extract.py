@@ -0,0 +1,65 @@
+"""
+Helpers for the :mod:`lxml`-backend of the parsers.
+
+Parsers implement ``parse_lxml`` (and ``parse_bs4`` as fallback) and select one via ``parse_backend``. XPath
+expressions should be compiled once with :class:`lxml.etree.XPath`, using :func:`has_class` in place of css-classes.
+The fallback obtains its :class:`bs4.BeautifulSoup` from :func:`soup`, such that :mod:`bs4` is only imported if used.
+"""
+import lxml.html
+
+
+def html_tree(html_string):
+    """Parse ``html_string`` and return root element."""
+    return lxml.html.document_fromstring(html_string)
+
+
+def soup(markup, features="lxml"):
+    """Return :class:`bs4.BeautifulSoup` of ``markup``."""
+    from bs4 import BeautifulSoup  # pylint: disable=import-outside-toplevel
+
+    return BeautifulSoup(markup, features)
+
+
+def has_class(name):
+    """Return XPath-predicate that matches elements with the css-class ``name``, like ``.name`` in css."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def stripped_strings(element, transparent=lambda tag: False):
+    """
+    Return stripped, non-empty strings of ``element`` like :attr:`bs4.Tag.stripped_strings`.
+
+    Text is split at every tag, except for tags with ``transparent(tag)``. Their text is merged with the surrounding
+    text (separated by a space).
+    """
+    chunks = []
+    current = []
+
+    def flush():
+        if current:
+            chunks.append(" ".join(current))
+            current.clear()
+
+    def add(text):
+        text = (text or "").strip()
+        if text:
+            current.append(text)
+
+    def walk(node):
+        add(node.text)
+        for child in node:
+            if not isinstance(child.tag, str):
+                flush()
+                add(child.tail)
+                continue
+            is_transparent = transparent(child.tag)
+            if not is_transparent:
+                flush()
+            walk(child)
+            if not is_transparent:
+                flush()
+            add(child.tail)
+
+    walk(element)
+    flush()
+    return chunks
@@ -1,12 +1,13 @@
 """Google images parser."""
 import itertools
 import json
-from typing import Dict
 
 import attr
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from .base import AsyncParser
+from .cache import DAY, response_cache
+from .extract import html_tree, soup
 
 
 def traverse(nested_list, tree_types=(list, tuple)):
@@ -29,16 +30,28 @@ class AsyncGoogleImages(AsyncParser):
 
     base_url: str = "https://www.google.com/search"
     limit: int = 20
+    cache_ttl = 7 * DAY
+
+    def cache_key(self, url, params):
+        """Ignore :attr:`to_lang`, such that the cached response is shared between templates."""
+        return response_cache.key(self.__class__.__name__, url, params, self.from_lang)
 
     def request_params(self):
         """Implement if necessary."""
         return {"q": self.phrase, "tbm": "isch", "lr": f"lang_{self.from_lang}"}
 
-    def parse_response(self, response: dict or list or str) -> Dict[str, list]:
-        """Implement."""
-        soup = BeautifulSoup(response, "lxml")
-        answer = str(soup.body.select("script")[-3])
-        # pprint(answer)
+    _scripts = etree.XPath("//body//script")
+
+    def parse_lxml(self, response):
+        """Extract image-urls from the json-data embedded in the scripts of the page."""
+        return self._parse_script(self._scripts(html_tree(response))[-3].text)
+
+    def parse_bs4(self, response):
+        """Extract image-urls from the json-data embedded in the scripts of the page."""
+        bs = soup(response)
+        return self._parse_script(str(bs.body.select("script")[-3]))
+
+    def _parse_script(self, answer):
         start = answer.find("data:") + len("data:")
         stop = answer.rfind("\n")
         json_obj = json.loads(answer[start:stop])
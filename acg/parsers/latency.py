@@ -0,0 +1,50 @@
+"""
+Latencies of the parser calls.
+
+Every call of :meth:`parsers.AsyncParser.__call__` that is not coalesced records its duration in
+:const:`parser_latency`, including cached responses and calls that raise. ``acg batch`` prints the summary.
+"""
+
+import statistics
+import threading
+
+import attr
+
+
+@attr.s(auto_attribs=True)
+class LatencyStats:
+    """Collect durations by name."""
+
+    _durations: dict = attr.ib(factory=dict)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock)
+
+    def record(self, name, seconds):
+        """Add duration ``seconds`` for ``name``."""
+        with self._lock:
+            self._durations.setdefault(name, []).append(seconds)
+
+    def summary(self):
+        """Return dict ``{name: {"calls": ..., "mean": ..., "p50": ..., "p95": ..., "max": ...}}``, times in seconds."""
+        with self._lock:
+            durations = {
+                name: sorted(values) for name, values in self._durations.items()
+            }
+        return {
+            name: {
+                "calls": len(values),
+                "mean": statistics.fmean(values),
+                "p50": values[len(values) // 2],
+                "p95": values[min(len(values) - 1, int(0.95 * len(values)))],
+                "max": values[-1],
+            }
+            for name, values in durations.items()
+        }
+
+    def clear(self):
+        """Forget all durations."""
+        with self._lock:
+            self._durations.clear()
+
+
+parser_latency = LatencyStats()
+"""Process-wide instance used by :meth:`parsers.AsyncParser.__call__`."""
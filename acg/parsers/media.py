@@ -0,0 +1,160 @@
+r"""
+Asynchronous download of media-files (audio, images) for the :class:`fields.MediaField`\ s.
+
+Downloads share the pooled session of :const:`parsers.session.session_manager`, are throttled by
+:const:`parsers.rate_limit.rate_limiter`, use the timeouts and retries of :const:`parsers.retry.request_policy` and are
+streamed into memory up to :attr:`MediaDownloader.max_bytes`.
+
+Downloads can be started early with :meth:`MediaDownloader.prefetch`, e.g. as soon as the parser that provides the
+url returns. A later call of :meth:`MediaDownloader.get` for the same url then only waits for the running download.
+Prefetched files that are not picked up are dropped after :attr:`MediaDownloader.prefetch_ttl` seconds or when they
+take up more than :attr:`MediaDownloader.max_prefetched_bytes`.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+import attr
+
+from ..utils import BACKGROUND_LOOP, run_async
+from .rate_limit import rate_limiter, retry_after_seconds
+from .retry import RETRY_STATUSES, request_policy
+from .session import session_manager
+
+
+class MediaTooLargeError(Exception):
+    """Error if a media-file exceeds :attr:`MediaDownloader.max_bytes`."""
+
+
+@attr.s(auto_attribs=True)
+class MediaDownloader:
+    """Download media-files concurrently on :const:`utils.BACKGROUND_LOOP`."""
+
+    max_bytes: int = 10 * 2 ** 20
+    """Downloads larger than this are aborted."""
+    chunk_size: int = 64 * 2 ** 10
+    """Size of the chunks the response is read in."""
+    max_prefetched: int = 64
+    """Maximal number of prefetched downloads kept until they are picked up by :meth:`get`."""
+    max_prefetched_bytes: int = 64 * 2 ** 20
+    """Maximal total size of the finished prefetched downloads that were not picked up yet."""
+    prefetch_ttl: float = 300
+    """Seconds after which a prefetched download that was not picked up is dropped."""
+    _pending: dict = attr.ib(factory=dict)
+    """Dict ``{url: (future, start time)}`` of the prefetched downloads."""
+    _lock: threading.Lock = attr.ib(factory=threading.Lock)
+
+    async def _read(self, response):
+        if (response.content_length or 0) > self.max_bytes:
+            raise MediaTooLargeError(response.url)
+        content = bytearray()
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            content.extend(chunk)
+            if len(content) > self.max_bytes:
+                raise MediaTooLargeError(response.url)
+        return bytes(content)
+
+    async def _fetch(self, url):
+        session = session_manager.get_session()
+        await rate_limiter.acquire(url)
+        async with session.get(url, timeout=request_policy.timeout()) as response:
+            retry_after = response.headers.get("Retry-After")
+            rate_limiter.feedback(url, response.status, retry_after)
+            content = await self._read(response) if response.status == 200 else None
+            return response.status, content, retry_after_seconds(retry_after)
+
+    async def fetch(self, url):
+        """
+        Download ``url`` and return its content.
+
+        Returns ``None`` if the download failed, also after all retries, or the file is too large.
+        """
+        from aiohttp import ClientError  # pylint: disable=import-outside-toplevel
+
+        print(f"downloading file from {url}...")
+        for attempt in range(request_policy.retries + 1):
+            try:
+                status, content, retry_after = await self._fetch(url)
+            except (ClientError, asyncio.TimeoutError):
+                status, retry_after = None, None
+            except MediaTooLargeError:
+                print(f"download aborted, file larger than {self.max_bytes} bytes :(")
+                return None
+            else:
+                if status == 200:
+                    print("done.")
+                    return content
+                if status not in RETRY_STATUSES:
+                    break
+            if attempt < request_policy.retries:
+                await asyncio.sleep(request_policy.delay(attempt, retry_after))
+        print("download failed :(")
+        return None
+
+    async def _fetch_on_own_loop(self, url):
+        try:
+            return await self.fetch(url)
+        finally:
+            await session_manager.close()
+
+    def prefetched_bytes(self):
+        """Return total size of the finished prefetched downloads. Not thread-safe."""
+        return sum(
+            len(future.result() or b"")
+            for future, _ in self._pending.values()
+            if future.done() and not future.cancelled()
+        )
+
+    def _drop_prefetched(self):
+        """Drop expired downloads and the oldest ones while there are too many or too large. Not thread-safe."""
+        now = time.monotonic()
+        for url, (future, started) in list(self._pending.items()):
+            if now - started > self.prefetch_ttl:
+                del self._pending[url]
+                future.cancel()
+        while self._pending and (
+            len(self._pending) >= self.max_prefetched
+            or self.prefetched_bytes() > self.max_prefetched_bytes
+        ):
+            future, _ = self._pending.pop(next(iter(self._pending)))
+            future.cancel()
+
+    def prefetch(self, url):
+        """Start download of ``url`` in the background. Can be called from any thread, including the event loop."""
+        with self._lock:
+            if url in self._pending:
+                return
+            self._drop_prefetched()
+            self._pending[url] = (
+                BACKGROUND_LOOP.submit(self.fetch(url)),
+                time.monotonic(),
+            )
+
+    def get(self, url):
+        """
+        Return content of ``url``, using a download started by :meth:`prefetch` if there is one. Blocking.
+
+        The event loop can not wait for its own coroutines, so if called from its thread, an unfinished prefetch is
+        cancelled and the file is downloaded on a temporary event loop in another thread.
+        """
+        with self._lock:
+            future, _ = self._pending.pop(url, (None, None))
+        on_loop = threading.current_thread() is BACKGROUND_LOOP.thread
+        if future is not None and on_loop and not future.done():
+            future.cancel()
+        elif future is not None:
+            try:
+                return future.result()
+            except CancelledError:
+                pass
+        if on_loop:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return executor.submit(
+                    asyncio.run, self._fetch_on_own_loop(url)
+                ).result()
+        return run_async(self.fetch(url))
+
+
+media_downloader = MediaDownloader()
+"""Process-wide instance used by the media-fields."""
@@ -2,9 +2,10 @@
 from typing import Dict
 
 import attr
-from bs4 import BeautifulSoup
+from lxml import etree
 
 from .base import AsyncParser
+from .extract import has_class, html_tree, soup
 
 
 @attr.s(auto_attribs=True)
@@ -21,17 +22,37 @@ class EnglishParser(AsyncParser):
     # def request_params(self):
     #     """Implement if necessary."""
 
-    def parse_response(self, response: dict or list or str) -> Dict[str, list]:
-        """Implement."""
-        soup = BeautifulSoup(response, "html.parser")
-        definitions = soup.find_all("div", class_="def ddef_d db")
-        synonyms = soup.find_all("span", class_="x-h dx-h")
-        examples = soup.find_all("span", class_="deg")
+    _definitions = etree.XPath("//div[@class='def ddef_d db']")
+    _synonyms = etree.XPath("//span[@class='x-h dx-h']")
+    _examples = etree.XPath(f"//span[{has_class('deg')}]")
+
+    def parse_lxml(self, response):
+        """Extract explanations, examples and synonyms."""
+        tree = html_tree(response)
+        return self._result_dict(
+            definitions=[d.text_content() for d in self._definitions(tree)],
+            examples=[ex.text_content() for ex in self._examples(tree)],
+            synonyms=[s.text_content() for s in self._synonyms(tree)],
+        )
+
+    def parse_bs4(self, response):
+        """Extract explanations, examples and synonyms."""
+        bs = soup(response, "html.parser")
+        return self._result_dict(
+            definitions=[
+                d.get_text() for d in bs.find_all("div", class_="def ddef_d db")
+            ],
+            examples=[ex.get_text() for ex in bs.find_all("span", class_="deg")],
+            synonyms=[s.get_text() for s in bs.find_all("span", class_="x-h dx-h")],
+        )
+
+    @staticmethod
+    def _result_dict(definitions, examples, synonyms) -> Dict[str, list]:
         return {
-            "explanation": [d.get_text()[:-2] for d in definitions],
+            "explanation": [d[:-2] for d in definitions],
             "explanation_trans": [None for _ in definitions],
-            "example": [ex.get_text().strip() for ex in examples],
+            "example": [ex.strip() for ex in examples],
             "example_trans": [None for _ in examples],
             "synonym_trans": [None for _ in synonyms],
-            "synonym": [s.get_text() for s in synonyms],
+            "synonym": synonyms,
         }
@@ -0,0 +1,170 @@
+"""
+Per-host rate limiting for all requests made by the app.
+
+Each host gets a :class:`TokenBucket`. The rates can be configured in the ``RateLimits`` section of the config as
+``host = rate, burst``, where ``rate`` is the number of requests per second and ``burst`` the number of requests that
+can be made at once. Hosts without entry use the ``default`` entry.
+
+If a host answers with ``429`` or ``503``, its rate is halved and requests are paused (respecting a ``Retry-After``
+header). Each successful response then increases the rate again until the configured rate is reached.
+"""
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+import attr
+
+RETRY_LATER_STATUSES = {429, 503}
+"""Status codes that indicate that the host wants us to slow down."""
+
+DEFAULT_RATE_LIMITS = {
+    "default": "4, 8",
+    "linguee-api.herokuapp.com": "2, 4",
+    "context.reverso.net": "2, 4",
+    "www.dicio.com.br": "2, 4",
+    "www.google.com": "1, 2",
+}
+"""Default entries of the ``RateLimits`` section of the config."""
+
+
+@attr.s(auto_attribs=True)
+class TokenBucket:
+    """Token bucket with adaptive rate."""
+
+    max_rate: float = 4
+    """Configured requests per second."""
+    burst: float = 8
+    """Size of the bucket."""
+    min_rate: float = 0.1
+    """Lower bound of :attr:`rate` when backing off."""
+    rate: float = None
+    """Current requests per second."""
+    tokens: float = None
+    updated: float = attr.ib(factory=time.monotonic)
+    paused_until: float = 0
+
+    def __attrs_post_init__(self):
+        self.rate = self.rate or self.max_rate
+        self.tokens = self.burst if self.tokens is None else self.tokens
+
+    def reserve(self):
+        """Take a token and return the number of seconds to wait before the request may be made."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        return delay + max(0, self.paused_until - now)
+
+    def back_off(self, retry_after=None):
+        """Halve :attr:`rate` and pause for ``retry_after`` seconds (defaults to one interval)."""
+        self.rate = max(self.min_rate, self.rate / 2)
+        pause = retry_after if retry_after is not None else 1 / self.rate
+        self.paused_until = max(self.paused_until, time.monotonic() + pause)
+
+    def recover(self):
+        """Increase :attr:`rate` additively up to :attr:`max_rate`."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+def parse_limit(value):
+    """
+    Parse config value of the form ``"rate, burst"`` or ``"rate"``. Return tuple ``(rate, burst)``.
+
+    Raises:
+        ValueError: If ``value`` is malformed, ``rate`` is not positive or ``burst`` is smaller than 1.
+    """
+    parts = [float(part) for part in str(value).split(",") if part.strip()]
+    if not 1 <= len(parts) <= 2:
+        raise ValueError(f"expected 'rate, burst', got {value!r}")
+    rate = parts[0]
+    burst = parts[1] if len(parts) > 1 else max(1.0, rate)
+    if not rate > 0 or not burst >= 1:
+        raise ValueError(f"rate must be > 0 and burst >= 1, got {value!r}")
+    return rate, burst
+
+
+def retry_after_seconds(value):
+    """Convert value of ``Retry-After`` header to seconds. Only the numeric form is supported."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@attr.s(auto_attribs=True)
+class RateLimiter:
+    """Hold one :class:`TokenBucket` per host."""
+
+    limits: dict = attr.ib(factory=lambda: dict(DEFAULT_RATE_LIMITS))
+    """Dict of the form ``{"host": "rate, burst"}``. The key ``"default"`` is used for all other hosts."""
+    _buckets: dict = attr.ib(factory=dict)
+    _lock: threading.Lock = attr.ib(factory=threading.Lock)
+
+    def configure(self, limits):
+        """
+        Replace :attr:`limits` and reset all buckets.
+
+        Invalid entries are replaced by their default in :const:`DEFAULT_RATE_LIMITS` or dropped, such that the host
+        uses the ``default`` entry.
+
+        Returns:
+            : Dict ``{host: value}`` of the invalid entries.
+        """
+        valid, invalid = {}, {}
+        for host, value in dict(limits).items():
+            try:
+                parse_limit(value)
+            except ValueError as error:
+                print(f"invalid rate limit for {host}, using the default: {error}")
+                invalid[host] = value
+            else:
+                valid[host] = value
+        with self._lock:
+            self.limits = {**DEFAULT_RATE_LIMITS, **valid}
+            self._buckets.clear()
+        return invalid
+
+    @staticmethod
+    def host(url):
+        """Return host of ``url``."""
+        return urlparse(str(url)).hostname or ""
+
+    def bucket(self, url):
+        """Return :class:`TokenBucket` for host of ``url``. Create it if necessary. Not thread-safe."""
+        host = self.host(url)
+        if host not in self._buckets:
+            rate, burst = parse_limit(self.limits.get(host, self.limits["default"]))
+            self._buckets[host] = TokenBucket(max_rate=rate, burst=burst)
+        return self._buckets[host]
+
+    def reserve(self, url):
+        """Return seconds to wait before a request to ``url`` may be made."""
+        with self._lock:
+            return self.bucket(url).reserve()
+
+    async def acquire(self, url):
+        """Wait asynchronously until a request to ``url`` may be made."""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def wait(self, url):
+        """Block until a request to ``url`` may be made."""
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def feedback(self, url, status, retry_after=None):
+        """Adapt rate of the host of ``url`` to the ``status`` of its response."""
+        with self._lock:
+            bucket = self.bucket(url)
+            if status in RETRY_LATER_STATUSES:
+                bucket.back_off(retry_after_seconds(retry_after))
+            elif status < 400:
+                bucket.recover()
+
+
+rate_limiter = RateLimiter()
+"""Process-wide instance used by parsers and media-downloads."""
@@ -0,0 +1,86 @@
+"""
+Timeouts and retries of the requests made by :class:`parsers.AsyncParser`.
+
+The values can be configured in the ``Requests`` section of the config.
+"""
+import random
+
+import attr
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+"""Status codes of responses that are worth a retry."""
+
+
+def parse_value(field, value):
+    """
+    Convert config ``value`` to the type of the attribute ``field``, e.g. ``"3.0"`` to ``3`` for an int.
+
+    Raises:
+        ValueError: If ``value`` is no number, no integer for an int attribute, or negative. Timeouts must be positive.
+    """
+    number = float(value)
+    if field.type is int:
+        if not number.is_integer():
+            raise ValueError(f"expected an integer, got {value!r}")
+        number = int(number)
+    if not number >= 0 or (field.name.endswith("_timeout") and not number > 0):
+        raise ValueError(f"expected a positive number, got {value!r}")
+    return number
+
+
+@attr.s(auto_attribs=True)
+class RequestPolicy:
+    """Timeouts and bounded retries with jittered exponential backoff."""
+
+    connect_timeout: float = 5
+    """Seconds to wait for a connection to be established."""
+    read_timeout: float = 15
+    """Seconds to wait for the next chunk of data of the response."""
+    retries: int = 3
+    """Number of retries after the first attempt."""
+    backoff: float = 0.5
+    """Base delay in seconds. Doubles with every attempt."""
+    max_backoff: float = 30
+    """Upper bound for the delay between two attempts."""
+
+    def configure(self, section):
+        """
+        Set attributes from ``section`` of the config. Keys that are not attributes are ignored.
+
+        Invalid values are replaced by the default of the attribute.
+
+        Returns:
+            : Dict ``{key: value}`` of the invalid values.
+        """
+        invalid = {}
+        for field in attr.fields(self.__class__):
+            if field.name in section:
+                try:
+                    value = parse_value(field, section[field.name])
+                except ValueError as error:
+                    print(f"invalid value for {field.name}, using the default: {error}")
+                    invalid[field.name] = section[field.name]
+                    value = field.default
+                setattr(self, field.name, value)
+        return invalid
+
+    def to_dict(self):
+        """Return attributes as dict of strings as used in the config."""
+        return {key: str(val) for key, val in attr.asdict(self).items()}
+
+    def timeout(self):
+        """Return :class:`aiohttp.ClientTimeout` with :attr:`connect_timeout` and :attr:`read_timeout`."""
+        from aiohttp import ClientTimeout  # pylint: disable=import-outside-toplevel
+
+        return ClientTimeout(
+            total=None, sock_connect=self.connect_timeout, sock_read=self.read_timeout
+        )
+
+    def delay(self, attempt, retry_after=None):
+        """Return seconds to wait before retry number ``attempt + 1``. Respects a ``Retry-After`` value."""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        return max(delay, retry_after or 0)
+
+
+request_policy = RequestPolicy()
+"""Process-wide instance used by all asynchronous parsers."""
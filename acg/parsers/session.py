@@ -0,0 +1,64 @@
+r"""
+Provides the :class:`SessionManager`, which shares one pooled :class:`aiohttp.ClientSession` between all parsers.
+
+Opening a new session per request means a new connector, DNS lookup and TLS handshake for every single request.
+Instead, all :class:`parsers.AsyncParser`\ s obtain their session from :const:`session_manager`, which keeps
+connections alive, limits the number of connections per host and caches DNS lookups.
+"""
+import asyncio
+
+import attr
+
+from ..utils import BACKGROUND_LOOP
+
+
+@attr.s(auto_attribs=True)
+class SessionManager:
+    """Create and hold one :class:`aiohttp.ClientSession` per event loop."""
+
+    limit: int = 100
+    """Maximal number of simultaneous connections."""
+    limit_per_host: int = 8
+    """Maximal number of simultaneous connections to the same host."""
+    ttl_dns_cache: int = 600
+    """Seconds DNS lookups are cached."""
+    keepalive_timeout: float = 60
+    """Seconds idle connections are kept open."""
+    _sessions: dict = attr.ib(factory=dict)
+
+    def _new_session(self):
+        # pylint: disable=import-outside-toplevel
+        from aiohttp import ClientSession, TCPConnector
+
+        connector = TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.ttl_dns_cache,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        return ClientSession(connector=connector)
+
+    def get_session(self):
+        """Return session for the running event loop. Create it if necessary."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self._sessions[loop] = self._new_session()
+        return session
+
+    async def close(self):
+        """Close session of the running event loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+    def shutdown(self):
+        """Close the session on :const:`utils.BACKGROUND_LOOP` and forget about sessions on other loops."""
+        loop = BACKGROUND_LOOP.loop
+        if loop is not None and loop in self._sessions and not loop.is_closed():
+            BACKGROUND_LOOP.run(self.close())
+        self._sessions.clear()
+
+
+session_manager = SessionManager()
+"""Process-wide instance used by all parsers."""
@@ -0,0 +1,51 @@
+"""
+Coalescing of identical, concurrent parser calls.
+
+If a phrase is looked up by the same parser with the same languages while an identical lookup is still in flight,
+e.g. because a word is queued by an import and searched manually at the same time, the second caller awaits the
+running lookup instead of making the same requests again.
+"""
+import asyncio
+import copy
+
+import attr
+
+
+@attr.s(auto_attribs=True)
+class SingleFlight:
+    """Share one in-flight task between callers with the same key."""
+
+    coalesced: int = 0
+    """Number of calls that awaited an already running call instead of starting a new one."""
+    _in_flight: dict = attr.ib(factory=dict)
+
+    async def do(self, key, coro_function):
+        """
+        Return result of ``await coro_function()``.
+
+        Concurrent calls with the same ``key`` share a single call. Every caller gets its own copy of the result, and
+        the shared call is not cancelled if one of the callers is. If ``key`` is ``None``, calls are not coalesced.
+        """
+        if key is None:
+            return await coro_function()
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = loop.create_task(coro_function())
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def _forget(self, key, task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def in_flight(self):
+        """Return number of running calls."""
+        return len(self._in_flight)
+
+
+single_flight = SingleFlight()
+"""Process-wide instance used by :meth:`parsers.AsyncParser.__call__`."""
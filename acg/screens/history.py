@@ -8,7 +8,7 @@ from kivymd.uix.menu import MDDropdownMenu
 from pony.orm import db_session
 
 from ..custom_widgets.dialogs import TextInputDialog
-from ..exporter import export_cookbook
+from ..exporter.export_chains import export_cookbook
 from ..utils import app_busy, not_implemented_toast, set_word_state
 
 
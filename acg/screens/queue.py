@@ -1,6 +1,8 @@
 """Contains the functions needed on the screen queue."""
 
 import threading
+from concurrent.futures import wait
+from functools import partial
 from queue import Queue
 
 from kivy.clock import Clock
@@ -9,14 +11,17 @@ from kivy.uix.floatlayout import FloatLayout
 from kivymd.app import MDApp
 from pony.orm import db_session
 
+from ..batch import BatchEngine
 from ..custom_widgets.custom_dropdown import open_dropdown_menu
 from ..importer import import_chain_cookbook
-from ..parsers import NoMatchError
+from ..parsers import response_cache
 from ..utils import (
     not_implemented_toast,
     set_screen,
     set_word_state,
     start_workers,
+    toast,
+    update_word_state_dict,
     widget_by_id,
 )
 
@@ -45,6 +50,12 @@ class QueuedRoot(FloatLayout):
     """: : :class:`~kivy.properties.DictProperty` of the form ``{"icon_name":"Help text"}``."""
     dialog = ObjectProperty()
     """:class:`~kivy.properties.ObjectProperty`. Instance of :class:`custom_widgets.dialogs.CustomDialog`."""
+    reschedule_counts = {}
+    """Number of times a word has been re-scheduled after a :class:`parsers.TransientError`."""
+    max_reschedules = 3
+    """Words are set to ``"error"`` after failing transiently this many times."""
+    reschedule_delay = 30
+    """Seconds after which a transiently failed word is queued again."""
 
     def __init__(self, **kwargs):
         self.speed_dial_buttons = import_chain_cookbook.to_button_dict()
@@ -68,6 +79,12 @@ class QueuedRoot(FloatLayout):
         """Placeholder-function."""
         not_implemented_toast()
 
+    @staticmethod
+    def clear_no_matches(*_):
+        """Forget all failed lookups of the parsers, such that they are requested again for every word."""
+        removed = response_cache.clear_no_matches()
+        toast(f"forgot {removed} failed lookups")
+
     @staticmethod
     def is_duplicate(word):
         """Check if word is ``app.word_state_dict``."""
@@ -77,25 +94,45 @@ class QueuedRoot(FloatLayout):
         """Check if word is in :attr:`queue`."""
         return word in self.queue
 
-    def worker_single_word(self):
+    def worker(self):
         """
-        Take a word from app.queue and process it, changing app.loading_state_dict accordingly.
+        Take words from :attr:`queue` and process them concurrently using a :class:`batch.BatchEngine`.
 
-        Repeat as long as app.queue is not empty.
+        The engine changes app.word_state_dict accordingly. Repeat as long as :attr:`queue` is not empty.
         """
-        local = threading.local()
-        local.template = MDApp.get_running_app().new_template_instance()
+        app = MDApp.get_running_app()
+        engine = BatchEngine(
+            template_factory=partial(app.new_template_instance, headless=True),
+            max_in_flight=app.max_in_flight,
+            on_state=self.on_state,
+            on_transient=self.reschedule,
+        )
         while not self.queue.empty():
-            word = self.queue.get()
-            if word not in self.stale:
-                MDApp.get_running_app().word_state_dict[word] = "loading"
-                try:
-                    local.template.search(word)
-                    MDApp.get_running_app().word_state_dict[word] = "ready"
-                except (NoMatchError, KeyError):
-                    MDApp.get_running_app().word_state_dict[word] = "error"
-            else:
-                self.stale.remove(word)
+            futures = []
+            while not self.queue.empty():
+                word = self.queue.get()
+                if word in self.stale:
+                    self.stale.remove(word)
+                    continue
+                futures.append(engine.submit(word))
+            wait(futures)
+        engine.shutdown()
+
+    def on_state(self, word, state):
+        """Update the state of ``word`` and forget its re-schedules once it was processed successfully."""
+        if state in {"ready", "done"}:
+            self.reschedule_counts.pop(word, None)
+        update_word_state_dict(word, state)
+
+    def reschedule(self, word):
+        """Queue ``word`` again after :attr:`reschedule_delay`. Return ``False`` if it failed too often already."""
+        count = self.reschedule_counts.get(word, 0)
+        if count >= self.max_reschedules:
+            self.reschedule_counts.pop(word, None)
+            return False
+        self.reschedule_counts[word] = count + 1
+        Clock.schedule_once(lambda *_: self.queue_word(word), self.reschedule_delay)
+        return True
 
     def queue_word(self, word):
         """Queue word for downloading."""
@@ -121,7 +158,7 @@ class QueuedRoot(FloatLayout):
         """If no worker is present, start a new one to download data."""
         if "worker" not in [thread.name for thread in threading.enumerate()]:
             print("starting a worker")
-            start_workers(self.worker_single_word, 1)
+            start_workers(self.worker, 1)
 
     def pause_downloading(self):
         """Empty the queue. Worker stop after finishing current task."""
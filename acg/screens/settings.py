@@ -1,5 +1,11 @@
 """Implements :class:`SettingsRoot`, the root widget for the settings screen."""
-from ..custom_widgets import PathSection, SectionBase, SettingsWidget, ThemeSection
+from ..custom_widgets import (
+    PathSection,
+    SectionBase,
+    SettingsWidget,
+    TextSection,
+    ThemeSection,
+)
 from ..design_patterns.factory import CookBook
 
 section_cookbook = CookBook()
@@ -7,6 +13,34 @@ section_cookbook.register("Theme")(ThemeSection)
 section_cookbook.register("Paths")(PathSection)
 
 
+@section_cookbook.register("RateLimits")
+class RateLimitSection(TextSection):
+    """Requests per second and burst size per host. See :mod:`parsers.rate_limit`."""
+
+    section = "RateLimits"
+
+
+@section_cookbook.register("Requests")
+class RequestSection(TextSection):
+    """Timeouts and retries of requests. See :mod:`parsers.retry`."""
+
+    section = "Requests"
+
+
+@section_cookbook.register("SQLite")
+class SQLiteSection(TextSection):
+    """Pragmas of the data-base, applied on the next start. See :mod:`sqlite_profile`."""
+
+    section = "SQLite"
+
+
+@section_cookbook.register("Lemmatizer")
+class LemmatizerSection(TextSection):
+    """Batch size and number of processes of the lemmatization, the latter only used by ``acg batch``."""
+
+    section = "Lemmatizer"
+
+
 @section_cookbook.register("Template")
 class TemplateSection(SectionBase):
     """Not implemented yet."""
@@ -16,9 +16,10 @@ class SingleWordRoot(FloatLayout):
     def on_template(self, *_):
         """Update :attr:`scroll_view` if self.template changes."""
         self.scroll_view.clear_widgets()
-        if self.template.parent:
-            self.template.parent.remove_widget(self.template)
-        self.scroll_view.add_widget(self.template)
+        layout = self.template.layout
+        if layout.parent:
+            layout.parent.remove_widget(layout)
+        self.scroll_view.add_widget(layout)
 
     @staticmethod
     def back_to_queue(*_):
@@ -31,7 +32,7 @@ class SingleWordRoot(FloatLayout):
         set_screen("queue")
 
     def refresh(self, *_):
-        """Crawl data and update database."""
-        self.template.set_data_from_parsers()
+        """Crawl data and update database. Parsers known to find no match are asked again."""
+        self.template.set_data_from_parsers(use_no_match_cache=False)
         self.template.update_fields()
         self.template.save_base_data_to_db()
@@ -0,0 +1,99 @@
+"""
+Pragmas applied to every connection of the data-base in :mod:`db`.
+
+The defaults trade a little durability for much cheaper commits: in WAL-mode with ``synchronous = NORMAL``, a commit
+does not wait for an fsync, and readers (e.g. the UI) are not blocked by the writing queue-workers. A crash can lose
+the last commits, but never corrupts the file.
+
+The values can be overwritten in the ``SQLite`` section of the config. Changes take effect on the next start. Invalid
+values are replaced by the default of the platform, such that a typo in the config can not keep the app from starting.
+"""
+import configparser
+import os
+
+from . import CONFIG_PATH
+
+PROFILES = {
+    "desktop": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": str(256 * 2 ** 20),
+        "cache_size": str(-64 * 2 ** 10),
+        "temp_store": "MEMORY",
+    },
+    "android": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": str(32 * 2 ** 20),
+        "cache_size": str(-8 * 2 ** 10),
+        "temp_store": "MEMORY",
+    },
+}
+"""Default pragmas per platform. A negative ``cache_size`` is in KiB, a positive one in pages."""
+
+KEYWORDS = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA", "0", "1", "2", "3"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY", "0", "1", "2"},
+}
+"""Valid values of the pragmas that take a keyword. All other pragmas of :const:`PROFILES` take a signed integer."""
+
+
+def platform():
+    """Return ``"android"`` or ``"desktop"``. Uses the same check as :mod:`kivy.utils`, without importing kivy."""
+    return "android" if "ANDROID_ARGUMENT" in os.environ else "desktop"
+
+
+def default_pragmas():
+    """Return pragmas of the current platform from :const:`PROFILES`."""
+    return dict(PROFILES[platform()])
+
+
+def parse_pragma(key, value):
+    """
+    Return ``value`` of the pragma ``key`` as it is inserted into the statement, i.e. an upper case keyword or integer.
+
+    Raises:
+        ValueError: If ``value`` is not one of the :const:`KEYWORDS` of ``key`` or no integer.
+    """
+    value = str(value).strip().upper()
+    if key in KEYWORDS:
+        if value not in KEYWORDS[key]:
+            raise ValueError(f"expected one of {sorted(KEYWORDS[key])}, got {value!r}")
+        return value
+    try:
+        return str(int(value))
+    except ValueError:
+        raise ValueError(f"expected an integer, got {value!r}") from None
+
+
+def configured_pragmas(config_path=CONFIG_PATH):
+    """
+    Return :func:`default_pragmas` updated by the ``SQLite`` section of the config-file at ``config_path``.
+
+    Invalid values are replaced by the default.
+
+    Returns:
+        : Tuple of the dict of pragmas and the dict ``{key: value}`` of the invalid values.
+    """
+    pragmas, invalid = default_pragmas(), {}
+    config = configparser.ConfigParser()
+    config.read(config_path)
+    if config.has_section("SQLite"):
+        for key, value in config["SQLite"].items():
+            if key not in pragmas:
+                continue
+            try:
+                pragmas[key] = parse_pragma(key, value)
+            except ValueError as error:
+                print(f"invalid value for pragma {key}, using the default: {error}")
+                invalid[key] = value
+    return pragmas, invalid
+
+
+def apply_pragmas(connection, pragmas):
+    """Execute ``PRAGMA key = value`` on the :class:`sqlite3.Connection` for all items of ``pragmas``."""
+    cursor = connection.cursor()
+    for key, value in pragmas.items():
+        cursor.execute(f"PRAGMA {key} = {value}")
+    cursor.close()
@@ -4,18 +4,15 @@ Implementation of :class:`Template` class and sub-classes.
 To add a new template, inherit from Template or a subclass and define the :attr:`parsers` and :attr:`fields` attributes.
 See e.g. the definition of :class:`PtTemplate`.
 """
-from functools import partial
+
+import asyncio
+from functools import lru_cache, partial
 from pprint import pprint
 from typing import Dict, List
 
 import attr
-from googletrans import Translator
-from kivy.lang import Builder
-from kivy.uix.boxlayout import BoxLayout
-from kivymd.toast import toast
 from pony.orm import commit, db_session
 
-from .custom_widgets.selection_widgets import SeparatorWithHeading
 from .db import db
 from .design_patterns.factory import CookBook
 from .fields import (
@@ -29,15 +26,30 @@ from .fields import (
     field_cookbook,
 )
 from .language_processing import tag_word_in_sentence
-from .parsers import AsyncParser, NoMatchError, Parser, parser_cookbook
-from .utils import app_busy, async_get_results, smart_dict_merge, timer
+from .parsers import (
+    AsyncParser,
+    KnownNoMatchError,
+    NoMatchError,
+    Parser,
+    TransientError,
+    media_downloader,
+    parser_cookbook,
+)
+from .utils import app_busy, run_async, smart_dict_merge, timer, toast
 
 template_cookbook = CookBook()
-translator = Translator()
+
+
+@lru_cache(maxsize=None)
+def get_translator():
+    """Return :class:`googletrans.Translator`. It is created on first use, as it is slow to import."""
+    from googletrans import Translator  # pylint: disable=import-outside-toplevel
+
+    return Translator()
 
 
 @attr.s(auto_attribs=True)
-class Template(BoxLayout):
+class Template:
     """Main class handling the data for the card-generation, database-access and user-selection."""
 
     fields: List[Field] = None
@@ -59,6 +71,12 @@ class Template(BoxLayout):
     field_cookbook: CookBook = field_cookbook
     parser_cookbook: CookBook = parser_cookbook
     parser_kwargs: dict = None
+    headless: bool = False
+    """If set, neither :attr:`layout` nor the widgets of the fields are constructed and nothing is scheduled on the
+    main thread. Used by the workers of the queue."""
+    layout: object = None
+    """:class:`custom_widgets.TemplateLayout` showing the widgets of :attr:`fields`. ``None`` if :attr:`headless`,
+    then kivy is not imported by the template."""
     _parser_names: list = None
 
     def __attrs_post_init__(self):
@@ -67,7 +85,12 @@ class Template(BoxLayout):
         self.parser_kwargs = self.parser_kwargs or {}
         if self._parser_names:
             self._init_parsers(self._parser_names)
-        super().__init__()
+        if not self.headless:
+            from .custom_widgets import (  # pylint: disable=import-outside-toplevel
+                TemplateLayout,
+            )
+
+            self.layout = TemplateLayout()
 
     def _init_parsers(self, parser_names):
         self.parsers = {}
@@ -97,14 +120,84 @@ class Template(BoxLayout):
         t_db = self.template_db()
         return t_db.get_card(self.search_term) or t_db.add_card(self.search_term)
 
-    def set_data_from_parsers(self):
-        """Collect all data obtained by the :class:`parsers.parser` in :attr:`data`."""
-        async_parsers = [
+    @db_session
+    def has_base_data(self, search_term):
+        """Check if the card with name ``search_term`` already contains base_data."""
+        return self.template_db().has_base_data(search_term)
+
+    @db_session
+    def set_card_state(self, search_term, state):
+        """Set state of the card with name ``search_term``. Create card if necessary."""
+        t_db = self.template_db()
+        card = t_db.get_card(search_term) or t_db.add_card(search_term)
+        card.state = state
+
+    def async_parsers(self):
+        r"""Return all :class:`parsers.AsyncParser`\ s in :attr:`parsers`."""
+        return [
             async_parser
             for async_parser in self.parsers.values()
             if isinstance(async_parser, AsyncParser)
         ]
-        self.data = async_get_results(async_parsers, self.search_term)
+
+    def media_fields(self):
+        r"""Return all :class:`fields.MediaField`\ s in :attr:`fields`."""
+        return [field for field in self.fields if isinstance(field, MediaField)]
+
+    async def fetch_parser_data(self, search_term, use_no_match_cache=True):
+        """
+        Gather the results of all asynchronous parsers for ``search_term`` in one dict.
+
+        The media-files of a result are prefetched as soon as the parser returns, see :meth:`prefetch_media`.
+        Parsers known to find no match for ``search_term`` are skipped if ``use_no_match_cache``, the results of the
+        others are merged.
+
+        Raises:
+            NoMatchError: If a parser finds no match or all parsers are skipped.
+        """
+        parsers = self.async_parsers()
+        results = await asyncio.gather(
+            *(
+                self._parser_result(parser, search_term, use_no_match_cache)
+                for parser in parsers
+            )
+        )
+        if parsers and all(result is None for result in results):
+            raise NoMatchError(
+                site=", ".join(parser.__class__.__name__ for parser in parsers)
+            )
+        return smart_dict_merge(*(result for result in results if result is not None))
+
+    async def _parser_result(self, parser, search_term, use_no_match_cache):
+        """Return result of ``parser``, or ``None`` if it is skipped as known to find no match."""
+        try:
+            result = await parser(search_term, use_no_match_cache=use_no_match_cache)
+        except KnownNoMatchError as error:
+            print(f"skipped {error.site}, known to find no match for {search_term}")
+            return None
+        self.prefetch_media(result)
+        return result
+
+    def prefetch_media(self, data):
+        """Start the downloads of the single urls of :meth:`media_fields` in ``data`` in the background."""
+        for field in self.media_fields():
+            url = data.get(field.field_name)
+            if url and isinstance(url, str):
+                media_downloader.prefetch(url)
+
+    def set_data_from_parsers(self, parser_data=None, use_no_match_cache=True):
+        """
+        Collect all data obtained by the :class:`parsers.parser` in :attr:`data`.
+
+        Args:
+            parser_data: Result of :meth:`fetch_parser_data`. If given, the asynchronous parsers are not called again.
+            use_no_match_cache: Passed on to :meth:`fetch_parser_data`. ``False`` to retry known failed lookups.
+        """
+        if parser_data is None:
+            parser_data = run_async(
+                self.fetch_parser_data(self.search_term, use_no_match_cache)
+            )
+        self.data = parser_data
         self.data[self.sort_field] = self.search_term
         sync_parsers = [
             parser for parser in self.parsers.values() if isinstance(parser, Parser)
@@ -114,18 +207,24 @@ class Template(BoxLayout):
         )
 
     def update_fields(self):
-        """Update all fields."""
+        """Update all fields. The downloads of all media-fields are started first, such that they run concurrently."""
+        for field in self.media_fields():
+            field.prefetch()
         for field in self.fields:
             with timer(field.__class__):
                 field.update()
 
     def add_field_widgets(self):
-        """For all :class:`fields.Field` with a widget, add it to the :class:`Template` itself."""
-        for field in self.fields:
-            if field.widget:
-                if field.heading:
-                    self.add_widget(SeparatorWithHeading(heading=field.heading))
-                self.add_widget(field.widget)
+        """For all :class:`fields.Field` with a widget, add it to :attr:`layout`."""
+        if self.layout:
+            self.layout.add_field_widgets(self.fields)
+
+    def notify(self, message):
+        """Show ``message`` as toast. Only print it if :attr:`headless`."""
+        if self.headless:
+            print(message)
+        else:
+            toast(message, duration=7)
 
     def get_content_from_fields(self):
         r"""
@@ -154,12 +253,17 @@ class Template(BoxLayout):
         self.current_card_db().base_data = self.data
         commit()
 
-    @app_busy
-    def get_results(self):
-        """Get final results for the card fields as dictionary."""
+    def make_card(self):
+        """Get the content of the fields, post-process it and save it to the card. Return :attr:`content`."""
         self.get_content_from_fields()
         self.post_process()
         self.add_content_to_db()
+        return self.content
+
+    @app_busy
+    def get_results(self):
+        """Get final results for the card fields as dictionary."""
+        self.make_card()
         pprint(self.content)
         return self.content
 
@@ -170,12 +274,18 @@ class Template(BoxLayout):
         self.update_fields()
 
     @db_session
-    def search(self, search_term, make_suggestion=False):
+    def search(
+        self,
+        search_term,
+        make_suggestion=False,
+        parser_data=None,
+        use_no_match_cache=True,
+    ):
         """
         Look up card with name ``search_term`` in data-base.
 
         Try to load data from card, if not possible use :meth:`set_data_from_parsers` to fetch data and save it to
-        data-base.
+        data-base. ``parser_data`` and ``use_no_match_cache`` are passed on to :meth:`set_data_from_parsers`.
         """
         self.search_term = search_term
         template_db = db.Template.get(name=self.name)
@@ -191,20 +301,27 @@ class Template(BoxLayout):
             except ValueError:
                 print("Could not load previously saved data. Request data anew...")
         try:
-            self.set_data_from_parsers()
+            self.set_data_from_parsers(parser_data, use_no_match_cache)
             self.update_fields()
             self.save_base_data_to_db()
         except NoMatchError as error:
             current_card.state = "error"
-            toast(f"{error.site} was not successful.", duration=7)
+            self.notify(f"{error.site} was not successful.")
             if make_suggestion:
                 # choose suggestion dialog here.
                 pass
+        except TransientError as error:
+            current_card.state = "waiting"
+            self.notify(f"{error.site} is not reachable right now. Try again later.")
 
     @app_busy
     def manual_search(self, search_term):
-        """Call :meth:`search` but with ``make_suggestion=True`` and @app_busy-decorator."""
-        self.search(search_term, make_suggestion=True)
+        """
+        Call :meth:`search` but with ``make_suggestion=True`` and @app_busy-decorator.
+
+        The user asked explicitly for ``search_term``, so parsers known to find no match are asked again.
+        """
+        self.search(search_term, make_suggestion=True, use_no_match_cache=False)
 
 
 @template_cookbook.register(
@@ -287,7 +404,11 @@ class VocabTemplate(Template):
 
     def translate(self, string):
         """Translate string from :attr:`from_lang` to :attr:`to_lang`."""
-        return translator.translate(string, src=self.from_lang, dest=self.to_lang).text
+        return (
+            get_translator()
+            .translate(string, src=self.from_lang, dest=self.to_lang)
+            .text
+        )
 
     def post_process(self):
         """Tag :attr:`search_term` in ``"explanation"`` and ``"example"`` fields."""
@@ -371,7 +492,11 @@ class VocabTemplateTwo(Template):
 
     def translate(self, string):
         """Translate string from :attr:`from_lang` to :attr:`to_lang`."""
-        return translator.translate(string, src=self.from_lang, dest=self.to_lang).text
+        return (
+            get_translator()
+            .translate(string, src=self.from_lang, dest=self.to_lang)
+            .text
+        )
 
     def post_process(self):
         """Tag :attr:`search_term` in ``"explanation"`` and ``"example"`` fields."""
@@ -387,17 +512,6 @@ class VocabTemplateTwo(Template):
                 self.content["word"] = "(to) " + self.content["word"]
 
 
-Builder.load_string(
-    """
-<Template>:
-    orientation: "vertical"
-    size_hint:1,None
-    height: self.minimum_height
-    padding: dp(10),dp(10),dp(10),dp(100)
-    spacing: dp(10)
-"""
-)
-
 # pylint: disable = W,C,R,I
 if __name__ == "__main__":
 
@@ -407,6 +521,6 @@ if __name__ == "__main__":
         def build(self):
             self.theme_cls.primary_palette = "Red"  # "Purple", "Red"
             self.theme_cls.theme_style = "Light"  # "Purple", "Red"
-            return template_cookbook.cook("Portuguese Vocabulary")
+            return template_cookbook.cook("Portuguese Vocabulary").layout
 
     _TestApp().run()
@@ -7,6 +7,7 @@ import os
 import pickle
 import pwd
 import re
+import sys
 import tempfile
 import threading
 from contextlib import ContextDecorator, contextmanager
@@ -18,10 +19,6 @@ from timeit import default_timer
 from typing import Any, Callable
 
 import toolz
-from kivymd.app import MDApp
-from kivymd.toast import toast
-from kivymd.uix.filemanager import MDFileManager
-from PIL import Image
 from pony.orm import db_session
 
 # GENERAL
@@ -146,11 +143,39 @@ def now_string():
 
 
 # KIVY
+#
+# kivy is only imported by the functions that need it, such that the data-processing (e.g. ``acg batch``) works
+# without it.
+
+
+def running_app():
+    """Return the running app, or ``None`` if there is none (e.g. ``acg batch``). Does not import kivy."""
+    app_module = sys.modules.get("kivymd.app")
+    return app_module.MDApp.get_running_app() if app_module else None
+
+
+def mainthread(func):
+    """Like :func:`kivy.clock.mainthread`, but :mod:`kivy.clock` is only imported when ``func`` is called."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        from kivy.clock import Clock  # pylint: disable=import-outside-toplevel
+
+        Clock.schedule_once(lambda _: func(*args, **kwargs), 0)
+
+    return wrapper
+
+
+def toast(*args, **kwargs):
+    """Call :func:`kivymd.toast.toast`."""
+    from kivymd import toast as kivymd_toast  # pylint: disable=import-outside-toplevel
+
+    kivymd_toast.toast(*args, **kwargs)
 
 
 def set_screen(screen_name):
     """Set current screen to the one with name ``screen_name``."""
-    MDApp.get_running_app().root.set_screen(None, screen_name)
+    running_app().root.set_screen(None, screen_name)
 
 
 def widget_by_id(string):
@@ -170,7 +195,7 @@ def widget_by_id(string):
     """
     id_list = string.split("/")
     id_list = [id_str for id_str in id_list if id_str != ""]
-    obj = MDApp.get_running_app().root
+    obj = running_app().root
     if id_list:
         first_id = id_list.pop(0)
         if first_id in obj.get_screen_names():
@@ -199,6 +224,8 @@ def pop_unchanged(dictionary):
 # Image resizing
 def compress_img_bytes(bytes_image, width=512):
     """Compress image given as bytes (e.g. as content of :class:`requests.Response`)."""
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+
     img = Image.open(BytesIO(bytes_image))
     if img.size[0] > width:
         resize = (width, width * img.size[1] // img.size[0])
@@ -222,6 +249,8 @@ def compress_img(path, width=512):
       path: Path to image-file.
       width: New width of image (Default value = 512)
     """
+    from PIL import Image  # pylint: disable=import-outside-toplevel
+
     img = Image.open(path)
     if img.size[0] > width:
         resize = (width, width * img.size[1] // img.size[0])
@@ -298,12 +327,12 @@ class AppBusyContext(ContextDecorator):
     previous_state = None
 
     def __enter__(self):
-        self.previous_state = MDApp.get_running_app().busy
-        MDApp.get_running_app().busy = True
+        self.previous_state = running_app().busy
+        running_app().busy = True
         return self
 
     def __exit__(self, *exc):
-        MDApp.get_running_app().busy = self.previous_state
+        running_app().busy = self.previous_state
         return False
 
 
@@ -318,14 +347,23 @@ def app_busy(func):
 
 
 def update_word_state_dict(word, state):
-    """Set state in app.word_state_dict."""
-    MDApp.get_running_app().word_state_dict[word] = state
+    """Set state in app.word_state_dict. Does nothing if the app is not running."""
+    app = running_app()
+    if app:
+        app.word_state_dict[word] = state
+
+
+def update_word_states(states):
+    """Set all states of the dict ``states`` in app.word_state_dict, dispatching a single update."""
+    app = running_app()
+    if app and states:
+        app.word_state_dict.update(states)
 
 
 @db_session
 def set_word_state(word, state):
     """Set state in the data-base entry of the card of the current template."""
-    template_db = MDApp.get_running_app().get_current_template_db()
+    template_db = running_app().get_current_template_db()
     card = template_db.get_card(word) or template_db.add_card(word)
     card.state = state
 
@@ -342,7 +380,7 @@ def get_username():
 
 def is_duplicate(word):
     """Check if word is already present in the app.word_state_dict."""
-    return word in MDApp.get_running_app().word_state_dict
+    return word in running_app().word_state_dict
 
 
 @contextmanager
@@ -351,7 +389,11 @@ def get_file_manager(ext=None, callback=None):
 
     Context manager to temporarily set `ext` and `callback` of file_manager.
     """
-    app = MDApp.get_running_app()
+    from kivymd.uix.filemanager import (  # pylint: disable=import-outside-toplevel
+        MDFileManager,
+    )
+
+    app = running_app()
     if getattr(app, "file_manager") is None:
         app.file_manager = MDFileManager()
     file_manager = app.file_manager
@@ -398,6 +440,61 @@ def timer(process):
     print(f"{process} took {default_timer() - start}s.")
 
 
+class BackgroundLoop:
+    """
+    Long-lived :mod:`asyncio` event loop running in a daemon thread.
+
+    All coroutines of the app are executed on this loop, such that objects bound to a loop (e.g. the
+    :class:`aiohttp.ClientSession` of :mod:`parsers.session`) can be reused between calls.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start :attr:`loop` in a new thread if it is not running yet and return it."""
+        with self._lock:
+            if self.loop is None or self.loop.is_closed():
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(
+                    target=self.loop.run_forever, name="event_loop", daemon=True
+                )
+                self.thread.start()
+            return self.loop
+
+    def submit(self, coro):
+        """Schedule ``coro`` on :attr:`loop` and return a :class:`concurrent.futures.Future`."""
+        return asyncio.run_coroutine_threadsafe(coro, self.start())
+
+    def run(self, coro, timeout=None):
+        """Run ``coro`` on :attr:`loop` and block until the result is available."""
+        if threading.current_thread() is self.thread:
+            raise RuntimeError(
+                "Can not block on the event loop from within its thread."
+            )
+        return self.submit(coro).result(timeout)
+
+    def stop(self):
+        """Stop :attr:`loop` and wait for its thread to finish."""
+        with self._lock:
+            if self.loop is None or self.loop.is_closed():
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+
+
+BACKGROUND_LOOP = BackgroundLoop()
+"""Event loop shared by all asynchronous parts of the app."""
+
+
+def run_async(coro, timeout=None):
+    """Run ``coro`` on the :const:`BACKGROUND_LOOP` and return its result."""
+    return BACKGROUND_LOOP.run(coro, timeout=timeout)
+
+
 async def async_wrapper(functions, *args):
     """Gather async functions."""
     return await asyncio.gather(*[a(*args) for a in functions])
@@ -405,4 +502,4 @@ async def async_wrapper(functions, *args):
 
 def async_get_results(functions: Callable[[Any], dict], *args):
     """Get merged dict from gathered async-run."""
-    return smart_dict_merge(asyncio.run(async_wrapper(functions, *args)))
+    return smart_dict_merge(run_async(async_wrapper(functions, *args)))